@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Author : schackartk
+Purpose: Get a better idea of model accuracy by running a lot
+Date   : 6 June 2020
+"""
+
+import argparse                  # Get command line arguments
+import helpers as hp             # Custom made helpers
+import matplotlib.pyplot as plt  # Plot accuracies
+import numpy as np               # Columnar test data
+import os                        # Working with files
+import seaborn as sn             # Generating heatmap
+import time                      # Time aggregation
+
+from typing import NamedTuple
+
+# Columns of an experiment, one .npy file each so they can be memory-mapped
+COLUMNS = ['id', 'label', 'pred', 'prob', 'run']
+
+# Running many models, saving each run's test data:
+# for i in $(seq 0 99); do ./bayes.py -o /tmp/model.pkl -e $i \
+#     -t ../data/test/test_data$i.npz; done
+
+
+class Args(NamedTuple):
+    """Command-line arguments"""
+    experiment: str
+    plot: bool
+    runs: list
+
+
+# --------------------------------------------------
+def get_args():
+    """Get command-line arguments"""
+    parser = argparse.ArgumentParser(
+        description='Assess model accuracy over many runs of bayes.py',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument(
+        'runs',
+        help='Test data files made by bayes.py, packed into --experiment',
+        metavar='FILE',
+        type=str,
+        nargs='*')
+
+    parser.add_argument(
+        '-e',
+        '--experiment',
+        help='Experiment directory',
+        metavar='DIR',
+        type=str,
+        default='../data/test/experiment')
+
+    parser.add_argument(
+        '-p',
+        '--plot',
+        help='Show confusion matrix and accuracy box plot',
+        action='store_true')
+
+    args = parser.parse_args()
+
+    return Args(experiment=args.experiment, plot=args.plot, runs=args.runs)
+
+
+# --------------------------------------------------
+def pack_runs(run_files, exp_dir):
+    """Concatenate test data of many runs into one column per file"""
+
+    columns = {col: [] for col in COLUMNS}
+    seeds = []
+
+    for run, run_file in enumerate(run_files):
+        with np.load(run_file) as data:
+            for col in COLUMNS[:-1]:
+                columns[col].append(data[col])
+            columns['run'].append(np.full(data['label'].size, run,
+                                          dtype=np.int32))
+            seeds.append(data['seed'])
+
+    os.makedirs(exp_dir, exist_ok=True)
+    for col, arrays in columns.items():
+        np.save(os.path.join(exp_dir, f'{col}.npy'), np.concatenate(arrays))
+    np.save(os.path.join(exp_dir, 'seed.npy'), np.array(seeds))
+
+
+# --------------------------------------------------
+def load_experiment(exp_dir):
+    """Memory-map every column of an experiment"""
+
+    return {col: np.load(os.path.join(exp_dir, f'{col}.npy'), mmap_mode='r')
+            for col in COLUMNS + ['seed']}
+
+
+# --------------------------------------------------
+def summarize(exp):
+    """Per-run accuracies and overall normalized confusion matrix"""
+
+    n_runs = exp['seed'].size
+    run = exp['run']
+    label = exp['label'].astype(bool)
+    pred = exp['pred'].astype(bool)
+
+    # Confusion counts of every run at once
+    def count(mask):
+        return np.bincount(run, weights=mask, minlength=n_runs)
+
+    tp = count(label & pred)
+    fn = count(label & ~pred)
+    tn = count(~label & ~pred)
+    fp = count(~label & pred)
+
+    with np.errstate(invalid='ignore'):
+        accuracy = (tp + tn) / (tp + fn + tn + fp)
+        balanced = (tp / (tp + fn) + tn / (tn + fp)) / 2
+
+    totals = np.array([[tn.sum(), fp.sum()], [fn.sum(), tp.sum()]])
+    conf = totals / totals.sum(axis=1, keepdims=True)
+
+    return accuracy, balanced, conf
+
+
+# --------------------------------------------------
+def plot_summary(balanced, conf):
+    """Show overall confusion matrix and spread of accuracies"""
+
+    plt.figure(figsize=(10, 7))
+    sn.heatmap(conf, annot=True, cmap=plt.cm.Blues)
+    plt.xlabel('Predicted Class')
+    plt.ylabel('Actual Class')
+    plt.title('Confusion Matrix \nAccuracy: '
+              f'{np.nanmean(balanced):.1%}', size=14)
+    plt.show()
+
+    plt.boxplot(balanced[~np.isnan(balanced)])
+    plt.show()
+
+
+# --------------------------------------------------
+def main():
+    """The good stuff"""
+
+    # Retrieve command-line arguments from argparse
+    args = get_args()
+    exp_dir = args.experiment
+
+    for f in args.runs:
+        if not os.path.isfile(f):
+            hp.die(f'Test data file "{f}" not found.')
+
+    if args.runs:
+        n_runs = len(args.runs)
+        pack_runs(args.runs, exp_dir)
+        print(f'Packed {n_runs} run{"" if n_runs == 1 else "s"} '
+              f'into "{exp_dir}".')
+    elif not os.path.isfile(os.path.join(exp_dir, 'run.npy')):
+        hp.die(f'Experiment "{exp_dir}" not found.')
+
+    start = time.perf_counter()
+    exp = load_experiment(exp_dir)
+    accuracy, balanced, conf = summarize(exp)
+    elapsed = time.perf_counter() - start
+
+    print(f'Aggregated {exp["seed"].size} runs ({exp["run"].size} '
+          f'predictions) in {elapsed * 1e3:.1f} ms')
+    print(f'{"":10}{"Mean":>8}{"Std":>8}')
+    print(f'{"Accuracy":10}{np.nanmean(accuracy):>8.1%}'
+          f'{np.nanstd(accuracy):>8.1%}')
+    print(f'{"Balanced":10}{np.nanmean(balanced):>8.1%}'
+          f'{np.nanstd(balanced):>8.1%}')
+
+    if args.plot:
+        plot_summary(balanced, conf)
+
+
+# --------------------------------------------------
+if __name__ == '__main__':
+    main()
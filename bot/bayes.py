@@ -8,13 +8,17 @@ Date   : 23 April 2020
 import argparse                  # Accept commandline arguments
 import helpers as hp             # Custom made helpers
 import matplotlib.pyplot as plt  # Generating graphical confusion matrix
+import numpy as np               # Columnar test data
 import pandas as pd              # Read csv as panda data frame
 import os                        # Working with files
 import pickle                    # Saving model for reuse
+import profiler                  # Optional profiling of runs
+import random                    # Pick a split seed
 import re                        # Regular expressions
 import seaborn as sn             # Generating heatmap
 import string
 
+from functools import lru_cache
 from nltk.corpus import stopwords
 from sklearn.feature_extraction.text import CountVectorizer
 from sklearn.metrics import confusion_matrix
@@ -26,11 +30,19 @@ from typing import NamedTuple
 # import nltk
 # nltk.download('stopwords')
 
+# Probability above which a title is called misspelled, until roc.py tunes it
+DEFAULT_THRESHOLD = 0.5
+
 
 class Args(NamedTuple):
     """Command-line arguments"""
+    alpha: float
     data: str
+    flame: bool
+    ngrams: int
     out: str
+    profile: str
+    seed: int
     subs: str
     test: str
     split: float
@@ -43,6 +55,14 @@ def get_args():
         description='Generate bayesian model for tonkatsu',
         formatter_class=argparse.ArgumentDefaultsHelpFormatter)
 
+    parser.add_argument(
+        '-a',
+        '--alpha',
+        help='Additive smoothing parameter of the model',
+        metavar='FLOAT',
+        type=float,
+        default=1.0)
+
     parser.add_argument(
         '-d',
         '--data',
@@ -51,6 +71,20 @@ def get_args():
         type=str,
         default='../data/all_labeled_data.txt')
 
+    parser.add_argument(
+        '-F',
+        '--flamegraph',
+        help='With --profile, also write collapsed stacks',
+        action='store_true')
+
+    parser.add_argument(
+        '-n',
+        '--ngrams',
+        help='Longest word n-gram used as a feature',
+        metavar='INT',
+        type=int,
+        default=1)
+
     parser.add_argument(
         '-o',
         '--out',
@@ -59,6 +93,24 @@ def get_args():
         type=str,
         default='../data/model.pkl')
 
+    parser.add_argument(
+        '-P',
+        '--profile',
+        help='Profile run, writing files starting with PREFIX',
+        metavar='PREFIX',
+        type=str,
+        nargs='?',
+        const='bayes_profile',
+        default='')
+
+    parser.add_argument(
+        '-e',
+        '--seed',
+        help='Random seed for the train/test split, None picks one at random',
+        metavar='INT',
+        type=int,
+        default=None)
+
     parser.add_argument(
         '-s',
         '--subreddits',
@@ -70,10 +122,10 @@ def get_args():
     parser.add_argument(
         '-t',
         '--test_out',
-        help='Test data output file',
+        help='Test data output file (npz)',
         metavar='FILE',
         type=str,
-        default='../data/test_data.txt')
+        default='../data/test_data.npz')
 
     parser.add_argument(
         '-r',
@@ -85,8 +137,12 @@ def get_args():
 
     args = parser.parse_args()
 
-    return Args(data=args.data, out=args.out,
-                subs=args.subreddits, test=args.test_out,
+    if args.ngrams < 1:
+        parser.error(f'--ngrams "{args.ngrams}" must be greater than 0')
+
+    return Args(alpha=args.alpha, data=args.data, flame=args.flamegraph,
+                ngrams=args.ngrams, out=args.out, profile=args.profile,
+                seed=args.seed, subs=args.subreddits, test=args.test_out,
                 split=args.test_split)
 
 
@@ -99,7 +155,17 @@ def filt_subs(raw_data, subs):
 
 
 # --------------------------------------------------
-def clean_title(raw_title):
+@lru_cache(maxsize=None)
+def get_stop_words(extra=('tonkatsu',)):
+    """Stop words to drop from titles, read from NLTK only once"""
+    stop = set(stopwords.words('english'))
+    stop.update(extra)
+
+    return frozenset(stop)
+
+
+# --------------------------------------------------
+def clean_title(raw_title, extra=('tonkatsu',)):
     """Take title strings and clean them"""
     # Ignore anything that is not in alphabet
     no_punct = raw_title.translate(str.maketrans('', '', string.punctuation))
@@ -109,15 +175,14 @@ def clean_title(raw_title):
     # Get rid of single letter words
     words = [w for w in words if not len(w) == 1]
     # Ignore stop words
-    stop = set(stopwords.words('english'))
-    stop.add('tonkatsu')
+    stop = get_stop_words(extra)
     meaningful_words = [w for w in words if w not in stop]
 
     return " ".join(meaningful_words)
 
 
 # --------------------------------------------------
-def get_features(stng, vec_obj):
+def get_features(stng, vec_obj, ngrams=1):
     """Get word feature vectors"""
     if vec_obj:
         # Here the vectorizer has already been trained and passed as an arg
@@ -129,7 +194,8 @@ def get_features(stng, vec_obj):
         # Initiate a new CountVectorizer and use it to generate features
         vectorizer = CountVectorizer(analyzer='word',
                                      preprocessor=None,
-                                     stop_words='english')
+                                     stop_words='english',
+                                     ngram_range=(1, ngrams))
 
         features = vectorizer.fit_transform(stng)
 
@@ -137,10 +203,10 @@ def get_features(stng, vec_obj):
 
 
 # --------------------------------------------------
-def generate_model(X_train, y_train):
+def generate_model(X_train, y_train, alpha=1.0):
     """Train Naive Bayes model"""
     # Generate a blank multinomial naive bayes model
-    naive_model = MultinomialNB()
+    naive_model = MultinomialNB(alpha=alpha)
 
     # Train the model
     classifier = naive_model.fit(X_train, y_train)
@@ -148,6 +214,23 @@ def generate_model(X_train, y_train):
     return classifier
 
 
+# --------------------------------------------------
+def threshold_accuracy(model, x_test, y_test, threshold=DEFAULT_THRESHOLD):
+    """Accuracy when a title is called misspelled at or above threshold"""
+    probs = model.predict_proba(x_test)[:, 1]
+
+    return float(np.mean((probs >= threshold) == np.asarray(y_test)))
+
+
+# --------------------------------------------------
+def unpack_model(pickle_tuple):
+    """Fields of a model artifact, older ones have no threshold"""
+    model, x_test, y_test, model_accuracy, vec, *rest = pickle_tuple
+    threshold = rest[0] if rest else DEFAULT_THRESHOLD
+
+    return model, x_test, y_test, model_accuracy, vec, threshold
+
+
 # --------------------------------------------------
 def make_confusion_matrix(model_prediction, y_test, accuracy_per):
     """Plot confusion matrix"""
@@ -161,16 +244,16 @@ def make_confusion_matrix(model_prediction, y_test, accuracy_per):
 
 
 # --------------------------------------------------
-def write_test_data(test_out, y_test, model_prediction, raw_data):
-    """Save data used for testing"""
-    with open(test_out, 'a') as fh:
-        i = 0
-        fh.write('Actual\tPredicted\tTitle\n')
-        for ind, label in y_test.items():
-            pred = model_prediction[i]
-            tit = raw_data.title[ind]
-            fh.write(f'{label}\t{pred}\t{tit}\n')
-            i += 1
+def write_test_data(test_out, ids, y_test, model_prediction, probs, seed):
+    """Save data used for testing, one array per column"""
+    # Written through a handle so numpy does not add an extension
+    with open(test_out, 'wb') as fh:
+        np.savez(fh,
+                 id=np.asarray(ids, dtype=str),
+                 label=np.asarray(y_test, dtype=np.int8),
+                 pred=np.asarray(model_prediction, dtype=np.int8),
+                 prob=np.asarray(probs, dtype=np.float32),
+                 seed=np.int64(seed))
 
 
 # --------------------------------------------------
@@ -185,12 +268,15 @@ def main():
     test_out = args.test
     split = args.split
 
+    prof = profiler.get_profiler(args.profile, args.flame)
+
     # Check for data file
     if not os.path.isfile(data_file):
         hp.die(f'Data file "{data_file}" not found.')
 
     # Read in labeled data
     raw_data = pd.read_csv(data_file, delimiter='\t', header=0)
+    prof.mark('read data')
 
     # Separate training
     subs = sub_list.split(sep=",")
@@ -204,39 +290,46 @@ def main():
     titles = []
     for i in range(raw_data.title.size):
         titles.append(clean_title(raw_data.title[i]))
+    prof.mark('clean titles')
 
     # Extract data labels
     y = raw_data.label
 
-    # Split data between train and test
+    # Split data between train and test, seed is saved with test data
+    seed = args.seed if args.seed is not None else random.randrange(2**31)
     t_train, t_test, y_train, y_test = train_test_split(titles, y,
-                                                        test_size=split)
+                                                        test_size=split,
+                                                        random_state=seed)
     print('Extracting features')
-    x_train, vectorizer = get_features(t_train, None)
+    x_train, vectorizer = get_features(t_train, None, args.ngrams)
     x_test, _ = get_features(t_test, vectorizer)
+    prof.mark('features')
 
     print('Training model')
-    model = generate_model(x_train, y_train)
+    model = generate_model(x_train, y_train, args.alpha)
+    prof.mark('train')
     print('Testing model')
-    model_prediction = model.predict(x_test)
+    probs = model.predict_proba(x_test)[:, 1]
+    model_prediction = (probs >= DEFAULT_THRESHOLD).astype(int)
     model_accuracy = model.score(x_test, y_test)
     accuracy_per = round(model_accuracy*1000)/10
     print('Model accuracy: {}%'.format(accuracy_per))
+    prof.mark('test')
 
     print('Assessing confusion matrix')
     make_confusion_matrix(model_prediction, y_test, accuracy_per)
-
-    if os.path.isfile(test_out):
-        os.remove(test_out)
-        print('Removing previous test data file.')
+    prof.mark('confusion matrix')
 
     print('Saving test data.')
-    write_test_data(test_out, y_test, model_prediction, raw_data)
+    write_test_data(test_out, raw_data.id[y_test.index], y_test,
+                    model_prediction, probs, seed)
 
     print('Saving pickle')
-    pickle_tuple = (model, x_test, y_test, model_accuracy, vectorizer)
+    pickle_tuple = (model, x_test, y_test, model_accuracy, vectorizer,
+                    DEFAULT_THRESHOLD)
     with open(pkl_file, 'wb') as file:
         pickle.dump(pickle_tuple, file)
+    prof.mark('save')
 
 
 # --------------------------------------------------
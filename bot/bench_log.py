@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Author : schackartk
+Purpose: Benchmark per-event logging cost on the bot's hot path
+Date   : 19 October 2026
+"""
+
+import argparse        # Get command line arguments
+import atexit          # Stop listener early without a second stop
+import contextlib      # Silence console output
+import logger          # Non-blocking, rotating log set up
+import logging         # Old style logging
+import os              # File paths
+import tempfile        # Scratch log files
+import time            # Time events
+
+from typing import NamedTuple
+
+
+class Args(NamedTuple):
+    """Command-line arguments"""
+    events: int
+    gap: float
+
+
+# --------------------------------------------------
+def get_args():
+    """Get command-line arguments"""
+    parser = argparse.ArgumentParser(
+        description='Benchmark bot logging',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument(
+        '-n',
+        '--events',
+        help='Number of events to log',
+        metavar='INT',
+        type=int,
+        default=2000)
+
+    parser.add_argument(
+        '-g',
+        '--gap',
+        help='Seconds between events, standing in for reddit requests',
+        metavar='FLOAT',
+        type=float,
+        default=0.001)
+
+    args = parser.parse_args()
+
+    if args.events < 1:
+        parser.error(f'--events "{args.events}" must be greater than 0')
+
+    return Args(events=args.events, gap=args.gap)
+
+
+# --------------------------------------------------
+def print_and_log(msg):
+    """Old style event, printed and logged straight to file"""
+
+    print(msg)
+    logging.info(msg)
+
+
+# --------------------------------------------------
+def time_events(log_event, n_events, gap):
+    """Average time spent in log_event, with a wait between events"""
+
+    hot = 0.0
+    for i in range(n_events):
+        start = time.perf_counter()
+        log_event(f'Tonkatsu found in post: {i}.')
+        hot += time.perf_counter() - start
+
+        # The bot spends most of its time waiting on reddit
+        time.sleep(gap)
+
+    return hot / n_events
+
+
+# --------------------------------------------------
+def time_print_and_log(log_file, n_events, gap):
+    """Per-event cost of a print plus a direct file log call"""
+
+    handler = logging.FileHandler(log_file, mode='a')
+    logging.getLogger().handlers = [handler]
+    logging.getLogger().setLevel(logging.INFO)
+
+    per_event = time_events(print_and_log, n_events, gap)
+
+    handler.close()
+
+    return per_event, 0.0
+
+
+# --------------------------------------------------
+def time_report(log_file, n_events, gap, json_lines):
+    """Per-event cost of a queued report() call, and time to drain"""
+
+    listener = logger.setup_logging(log_file, json_lines=json_lines)
+
+    per_event = time_events(logger.report, n_events, gap)
+
+    start = time.perf_counter()
+    listener.stop()
+    atexit.unregister(listener.stop)
+    drain = time.perf_counter() - start
+
+    return per_event, drain
+
+
+# --------------------------------------------------
+def main():
+    """The good stuff"""
+
+    args = get_args()
+    n_events = args.events
+    gap = args.gap
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp_dir, \
+            open(os.devnull, 'w') as devnull, \
+            contextlib.redirect_stdout(devnull):
+        log_file = os.path.join(tmp_dir, '.log')
+
+        results.append(('print + logging',
+                        *time_print_and_log(log_file, n_events, gap)))
+        results.append(('report (text)',
+                        *time_report(log_file, n_events, gap, False)))
+        results.append(('report (json)',
+                        *time_report(log_file, n_events, gap, True)))
+
+        # Leave logging as it was found
+        logging.getLogger().handlers = []
+
+    base = results[0][1]
+    print(f'{"Method":18}{"us/event":>10}{"Speedup":>10}{"Drain (s)":>11}')
+    for name, per_event, drain in results:
+        print(f'{name:18}{per_event * 1e6:>10.2f}{base / per_event:>9.1f}x'
+              f'{drain:>11.3f}')
+
+
+# --------------------------------------------------
+if __name__ == '__main__':
+    main()
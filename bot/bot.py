@@ -8,25 +8,50 @@ Date   : 22 April 2020
 import argparse        # Get command line arguments
 import bayes           # My model file
 import config          # log in information file
+import hashlib         # Fingerprint model file
 import helpers as hp   # Custom made helpers
+import journal as jn   # Crash-safe record of actions
 import logging         # Generate log of activity
+import logger          # Non-blocking, rotating log set up
 import os              # Check for and delete files
 import pickle          # Read pickled model file
 import praw            # Interact with reddit
+import profiler        # Optional profiling of runs
 import re              # Regular expressions for post url
-import time            # Time actions
+import router          # Per-subreddit models
+import threading       # Serialize shared state between phases
 
+from cache import PredictionCache
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import NamedTuple
 
+# Guards the shared history dict and appends to the data files, since the
+# scan, summon and purge phases run concurrently
+STATE_LOCK = threading.RLock()
+
+# Times a journaled action is retried before it is abandoned
+MAX_REPLAYS = 3
+
 
 class Args(NamedTuple):
     """ Command-line arguments"""
+    cache: str
+    cache_size: int
     comment: str
     debug: bool
     deleted: str
+    flame: bool
+    journal: str
+    json_log: bool
     log: str
+    log_backups: int
+    log_gzip: bool
+    log_size: int
+    log_when: str
     model: str
     posts: str
+    profile: str
     subs: str
 
 
@@ -37,6 +62,22 @@ def get_args():
         description='Run the Tonkotsu Reddit Bot',
         formatter_class=argparse.ArgumentDefaultsHelpFormatter)
 
+    parser.add_argument(
+        '-C',
+        '--cache',
+        help='Prediction cache file',
+        metavar='FILE',
+        type=str,
+        default='../data/prediction_cache.json')
+
+    parser.add_argument(
+        '-n',
+        '--cache_size',
+        help='Maximum number of cached predictions',
+        metavar='INT',
+        type=int,
+        default=10000)
+
     parser.add_argument(
         '-c',
         '--comment',
@@ -59,6 +100,20 @@ def get_args():
         type=str,
         default='../data/deleted.txt')
 
+    parser.add_argument(
+        '-F',
+        '--flamegraph',
+        help='With --profile, also write collapsed stacks',
+        action='store_true')
+
+    parser.add_argument(
+        '-J',
+        '--journal',
+        help='Journal of actions in progress, for crash recovery',
+        metavar='FILE',
+        type=str,
+        default='../data/journal.jsonl')
+
     parser.add_argument(
         '-l',
         '--log',
@@ -67,10 +122,46 @@ def get_args():
         type=str,
         default='../data/.log')
 
+    parser.add_argument(
+        '-b',
+        '--log_backups',
+        help='Number of rotated log files to keep',
+        metavar='INT',
+        type=int,
+        default=5)
+
+    parser.add_argument(
+        '-j',
+        '--json_log',
+        help='Write log as JSON lines',
+        action='store_true')
+
+    parser.add_argument(
+        '-S',
+        '--log_size',
+        help='Rotate log once it reaches this many bytes',
+        metavar='INT',
+        type=int,
+        default=1000000)
+
+    parser.add_argument(
+        '-w',
+        '--log_when',
+        help='Rotate log by time instead of size (e.g. midnight, W0)',
+        metavar='STR',
+        type=str,
+        default='')
+
+    parser.add_argument(
+        '-z',
+        '--log_gzip',
+        help='Compress rotated log files',
+        action='store_true')
+
     parser.add_argument(
         '-m',
         '--model',
-        help='Model for classifying titles',
+        help='Model or bundle for classifying titles',
         metavar='PKL',
         type=str,
         default='../data/model.pkl')
@@ -83,6 +174,16 @@ def get_args():
         type=str,
         default='../data/id_file.txt')
 
+    parser.add_argument(
+        '-P',
+        '--profile',
+        help='Profile run, writing files starting with PREFIX',
+        metavar='PREFIX',
+        type=str,
+        nargs='?',
+        const='bot_profile',
+        default='')
+
     parser.add_argument(
         '-s',
         '--subreddits',
@@ -93,10 +194,18 @@ def get_args():
 
     args = parser.parse_args()
 
-    return Args(comment=args.comment, debug=args.Debug,
-                deleted=args.deleted, log=args.log,
+    if args.cache_size < 1:
+        parser.error(f'--cache_size "{args.cache_size}" '
+                     'must be greater than 0')
+
+    return Args(cache=args.cache, cache_size=args.cache_size,
+                comment=args.comment, debug=args.Debug,
+                deleted=args.deleted, flame=args.flamegraph,
+                journal=args.journal, json_log=args.json_log, log=args.log,
+                log_backups=args.log_backups, log_gzip=args.log_gzip,
+                log_size=args.log_size, log_when=args.log_when,
                 model=args.model, posts=args.posts,
-                subs=args.subreddits)
+                profile=args.profile, subs=args.subreddits)
 
 
 # --------------------------------------------------
@@ -115,6 +224,18 @@ def get_history(id_file):
     return id_dict
 
 
+# --------------------------------------------------
+def claim_id(id_dict, post_id, pred='NA'):
+    """Mark post as handled in shared history, False if already there"""
+
+    with STATE_LOCK:
+        if post_id in id_dict:
+            return False
+        id_dict[post_id] = pred
+
+    return True
+
+
 # --------------------------------------------------
 def get_comment(msg_file):
     """Get canned bot comment"""
@@ -133,145 +254,349 @@ def save_id(id_file, post_id, pred, act, sub, title):
     logging.debug(f'Saving ID\'s to "{id_file}"')
 
     # Save id and predicted classification to id_file
-    with open(id_file, 'a') as fh:
+    with STATE_LOCK, open(id_file, 'a') as fh:
         print(f'{post_id}\t{pred}\t{act}\t{sub}\t{title}',
               file=fh)
 
     logging.debug(f'ID\'s saved to "{id_file}"')
 
 
+# --------------------------------------------------
+def new_reddit():
+    """Reddit instance for the bot, nothing is sent until first used"""
+
+    # Sign into reddit with praw using config.py info
+    return praw.Reddit(username=config.username,
+                       password=config.password,
+                       client_id=config.client_id,
+                       client_secret=config.client_secret,
+                       user_agent='Tonkotsu Police v0.1')
+
+
 # --------------------------------------------------
 def bot_login():
     """Sign bot into reddit"""
 
     # Give feedback on login process
-    print('Logging in... ', end='')
-    login_time = time.strftime('%Y/%m/%d %X')
-    logging.info(f'{login_time}: Logging in.')
+    logger.report('Logging in...')
 
-    # Sign into reddit with praw using config.py info
-    r = praw.Reddit(username=config.username,
-                    password=config.password,
-                    client_id=config.client_id,
-                    client_secret=config.client_secret,
-                    user_agent='Tonkotsu Police v0.1')
-    print('log in successful.')
-    print(f'Logged in as {config.username}.')
-    logging.debug('log in successful.')
-    logging.debug(f'Logged in as {config.username}.')
+    r = new_reddit()
+    logger.report(f'Logged in as {config.username}.')
 
     return r
 
 
 # --------------------------------------------------
-def predict(text, model_file):
-    """Use previously trained model to classify title text"""
+@lru_cache(maxsize=None)
+def load_model(model_file):
+    """Load model or bundle once per run, with a fingerprint"""
 
-    # Unpickle Bayesian model file, made by bayes.py
+    # Read once, so the fingerprint matches exactly what was unpickled
     with open(model_file, 'rb') as file:
-        model, x_test, y_test, model_accuracy, vec = pickle.load(file)
+        raw = file.read()
+
+    # Unpickle model made by bayes.py, or bundle of them made by bundle.py
+    tuples = router.read_artifacts(pickle.loads(raw))
+
+    # Check that each model is importing okay
+    for model, x_test, y_test, model_accuracy, _, _ in tuples.values():
+        if model_accuracy != model.score(x_test, y_test):
+            hp.warn('Saved and test model accuracy do not match')
+
+    # Threshold is part of the artifact, so changing it changes the version
+    version = hashlib.sha256(raw).hexdigest()
 
-    # Check that model is importing okay
-    if model_accuracy != model.score(x_test, y_test):
-        hp.warn('Saved and test model accuracy do not match')
+    return router.make_router(tuples), version
+
+
+# --------------------------------------------------
+def predict(text, model_file, cache=None, sub=None):
+    """Use previously trained model for subreddit to classify title text"""
+
+    name, (model, vec, threshold) = load_model(model_file)[0].route(sub)
+
+    # Clean title the same way as for training, also used as cache key
+    title = bayes.clean_title(text)
+    key = f'{name}:{title}' if name else title
+
+    if cache is not None:
+        prediction = cache.get(key)
+        if prediction is not None:
+            return prediction
 
     # Get features from the text using old vectorizer
-    text_features, _ = bayes.get_features([text], vec)
+    text_features, _ = bayes.get_features([title], vec)
 
-    # Get predicted classification using pickled model
-    prediction = model.predict(text_features)
+    # Misspelled if probability reaches the threshold chosen by roc.py
+    prediction = int(model.predict_proba(text_features)[0, 1] >= threshold)
+
+    if cache is not None:
+        cache.put(key, prediction)
 
     return prediction
 
 
 # --------------------------------------------------
-def leave_comment(post, cmt_file):
+def find_reply(parent):
+    """Find bot's existing reply to a post or comment, if any"""
+
+    # Comments ('t1_') list replies only once refreshed, posts ('t3_') don't
+    if parent.fullname.startswith('t1_'):
+        parent.refresh()
+        replies = parent.replies
+    else:
+        replies = parent.comments
+
+    replies.replace_more(limit=0)
+    for reply in replies:
+        if reply.author and reply.author.name == config.username:
+            return reply
+
+    return None
+
+
+# --------------------------------------------------
+def reply_once(parent, text, journal, entry, step):
+    """Reply to post or comment, unless an earlier attempt already did"""
+
+    # A crash after replying but before recording it leaves only 'step-'
+    if f'{step}-' in entry['steps']:
+        reply = find_reply(parent)
+        if reply is not None:
+            return reply
+    else:
+        journal.step(entry, f'{step}-')
+
+    return parent.reply(text)
+
+
+# --------------------------------------------------
+def find_message(r, to, subject, body):
+    """Find a message the bot already sent, if any"""
+
+    for message in r.inbox.sent(limit=100):
+        if str(message.dest).lower() == to.lower() and \
+                message.subject == subject and \
+                message.body.strip() == body.strip():
+            return message
+
+    return None
+
+
+# --------------------------------------------------
+def message_once(r, to, subject, body, journal, entry, step):
+    """Send message, unless an earlier attempt already did"""
+
+    if step in entry['steps']:
+        return
+
+    # As with replies, only 'step-' means it may have gone out already
+    if f'{step}-' not in entry['steps'] or \
+            find_message(r, to, subject, body) is None:
+        journal.step(entry, f'{step}-')
+        r.redditor(to).message(subject, body)
+
+    journal.step(entry, step)
+
+
+# --------------------------------------------------
+def notify(r, subject, journal, entry):
+    """Send the journaled note to bot and human accounts"""
+
+    for who, name in [('bot', config.username), ('human', config.human_acct)]:
+        message_once(r, name, subject, entry['data']['note'], journal, entry,
+                     f'told-{who}')
+
+    logging.info('Sent messages.')
+
+
+# --------------------------------------------------
+def leave_comment(post, cmt_file, journal, entry):
     """leave bot comment"""
 
+    if 'commented' in entry['steps']:
+        return
+
     cmt = get_comment(cmt_file)
 
-    cmt_obj = post.reply(cmt)
+    cmt_obj = reply_once(post, cmt, journal, entry, 'comment')
 
     cmt = cmt.format(id=cmt_obj.fullname)
-    cmt_obj.edit(cmt)
+    cmt_obj.edit(cmt)  # Editing again on replay does no harm
+    journal.step(entry, 'commented', comment=cmt_obj.id)
 
 
 # --------------------------------------------------
-def delete_comment(r, comment, del_file):
+def delete_comment(r, comment, del_file, journal, entry=None):
     """delete comment"""
 
     user_name = config.username
 
-    if comment.author.name == user_name:
-        comment.delete()
-        msg = f'Comment removed: {comment.id}.'
-        r.redditor(user_name).message('Comment Removed', msg)
+    if entry is None:
+        # Decided up front, a comment no longer shows its author once deleted
+        author = str(comment.author)
+        entry = journal.begin('delete', comment=comment.id, author=author,
+                              own=author == user_name,
+                              post=comment.link_id[3:])
+
+    data = entry['data']
+    row = data['comment']
+
+    if data['own']:
+        # Post is kept so deletions can be joined with predictions
+        row = f'{data["comment"]}\t{data["post"]}'
+        if 'deleted' not in entry['steps']:
+            # After a crash at 'delete-', a comment with no author is gone
+            if 'delete-' not in entry['steps'] or comment.author is not None:
+                journal.step(entry, 'delete-')
+                comment.delete()
+            journal.step(entry, 'deleted')
+        msg = f'Comment removed: {data["comment"]}.'
+        message_once(r, user_name, 'Comment Removed', msg, journal, entry,
+                     'messaged')
     else:
-        msg = f'Comment by {comment.author}'
+        msg = f'Comment by {data["author"]}'
 
-    print(msg)
-    logging.info(msg)
-    with open(del_file, 'a') as fh:  # Record deleted commented id
-        print(comment.id, file=fh)
+    logger.report(msg)
+    # Record deleted commented id
+    if 'recorded' not in entry['steps']:
+        with STATE_LOCK, open(del_file, 'a') as fh:
+            print(row, file=fh)
+        journal.step(entry, 'recorded')
+
+    journal.done(entry)
 
 
 # --------------------------------------------------
-def react_to_post(post, pred, act, cmt_file, id_file):
-    """save post info, comment if predicted mistake"""
+def react_to_post(r, post, pred, act, msg, cmt_file, id_file, journal,
+                  entry=None):
+    """save post info, comment if predicted mistake, notify"""
 
-    str1 = f'Model predicted {"in" if pred else ""}correct spelling.'
-    str2 = f'{"C" if act else "Not c"}ommenting.'
-    print(str1)
-    print(f'{str2}..\n')
-    logging.info(f'{str1} {str2}')
+    if entry is None:
+        str1 = f'Model predicted {"in" if pred else ""}correct spelling.'
+        str2 = f'{"C" if act else "Not c"}ommenting.'
+        logger.report(f'{str1} {str2}')
 
-    sub = post.subreddit.display_name
-    title = post.title
+        note = f'{msg}: [{post.id}]({post.permalink})\n"{post.title}"'
+        entry = journal.begin('post', post=post.id, pred=pred, act=act,
+                              sub=post.subreddit.display_name,
+                              title=post.title, note=note)
 
-    save_id(id_file, post.id, pred, act, sub, title)
+    data = entry['data']
 
     if act:
-        leave_comment(post, cmt_file)
+        leave_comment(post, cmt_file, journal, entry)
         logging.info('Commented on post.')
 
+    # Send messages notifying decision
+    notify(r, 'Tonkatsu Found', journal, entry)
+
+    # Saved last, so a post is in the history only once fully handled
+    if 'saved' not in entry['steps']:
+        save_id(id_file, post.id, pred, act, data['sub'], data['title'])
+        journal.step(entry, 'saved')
+
+    journal.done(entry)
+
 
 # --------------------------------------------------
-def react_to_summon(r, cmt_file, id_file, mention):
+def react_to_summon(r, cmt_file, id_file, mention, journal, entry=None):
     """comment from summons"""
 
-    summoner = mention.author
-    sub = mention.subreddit.display_name
-    parent_id = mention.parent_id
+    if entry is None:
+        logger.report('Responding to summon.')
+
+        # Post address, no comment info
+        post_add = re.sub(r'[?]context=\d+', '', mention.context)
+        note = f'Summon found: [{mention.id}]({post_add})\n\n"{mention.body}"'
+        entry = journal.begin('summon', mention=mention.id,
+                              summoner=str(mention.author),
+                              sub=mention.subreddit.display_name,
+                              parent=mention.parent_id, note=note)
+
+    data = entry['data']
+    sub = data['sub']
+    parent_id = data['parent']
     post_id = parent_id[3:]
 
-    print('Responding to summon.\n')
-    logging.info('Responding to summon.')
-    save_id(id_file, parent_id, 's', 1, sub, 'NA')
-    save_id(id_file, post_id, 's', 'NA', sub, 'NA')
+    if 'saved' not in entry['steps']:
+        save_id(id_file, parent_id, 's', 1, sub, 'NA')
+        save_id(id_file, post_id, 's', 'NA', sub, 'NA')
+        journal.step(entry, 'saved')
 
     if 't3_' in parent_id and sub != 'food':
         # respond to original post
-        post_id = parent_id[3:]
         post = r.submission(id=post_id)
-        leave_comment(post, cmt_file)
+        leave_comment(post, cmt_file, journal, entry)
         logging.info('Commented on post.')
-        mention.reply(f'Thank you /u/{summoner} for the tip!')
-        logging.info('Commented on summoning')
+        if 'thanked' not in entry['steps']:
+            reply_once(mention, f'Thank you /u/{data["summoner"]} for the '
+                       'tip!', journal, entry, 'thank')
+            journal.step(entry, 'thanked')
+            logging.info('Commented on summoning')
+
+    # Send messages notifying decision
+    notify(r, 'Bot Summoned', journal, entry)
+
+    journal.done(entry)
 
 
 # --------------------------------------------------
-def investigate(r, cmt_file, id_file, model_file, subs):
-    """Look for tonkotsu misspelling"""
-    ct = 0  # Number of instances corrected
+def replay(r, cmt_file, id_file, del_file, journal, entry):
+    """Finish one journaled action, skipping steps already done"""
+
+    data = entry['data']
+    if entry['action'] == 'post':
+        react_to_post(r, r.submission(id=data['post']), data['pred'],
+                      data['act'], None, cmt_file, id_file, journal, entry)
+    elif entry['action'] == 'summon':
+        mention = r.comment(id=data['mention'])
+        react_to_summon(r, cmt_file, id_file, mention, journal, entry)
+    elif entry['action'] == 'delete':
+        delete_comment(r, r.comment(id=data['comment']), del_file, journal,
+                       entry)
+    else:
+        raise ValueError(f'Unknown action "{entry["action"]}"')
 
-    user_name = config.username
-    human_name = config.human_acct
 
-    # Get previously assessed post id's
-    id_dict = get_history(id_file)
+# --------------------------------------------------
+def recover(r, cmt_file, id_file, del_file, journal):
+    """Finish actions left incomplete by an earlier run"""
+
+    pending = journal.pending()
+    if not pending:
+        return
+
+    logger.report(f'Recovering {len(pending)} incomplete '
+                  f'action{"" if len(pending) == 1 else "s"}.')
+
+    for entry in pending:
+        try:
+            replay(r, cmt_file, id_file, del_file, journal, entry)
+        # Post removed or locked, comment gone, anything: one bad entry must
+        # not stop this run, nor every run after it
+        except Exception as err:  # pylint: disable=broad-except
+            failed = entry['steps'].get('failed', {})
+            attempts = failed.get('attempts', 0) + 1
+            logging.exception(f'Replaying {entry["action"]} {entry["id"]} '
+                              f'failed (attempt {attempts}).')
+            journal.step(entry, 'failed', attempts=attempts, error=str(err))
+
+            # Give up for good, so the journal can be emptied again
+            if attempts >= MAX_REPLAYS:
+                logger.report(f'Abandoned {entry["action"]} {entry["id"]} '
+                              f'after {attempts} failed attempts.')
+                journal.step(entry, 'abandoned')
+                journal.done(entry)
 
-    print('Scanning...\n')
-    logging.info('Scanning posts...')
+
+# --------------------------------------------------
+def investigate(r, cmt_file, id_file, model_file, subs, id_dict, cache,
+                journal):
+    """Look for tonkotsu misspelling"""
+    ct = 0  # Number of instances corrected
+
+    logger.report('Scanning posts...')
 
     # Collect newest 25 posts
     posts = r.subreddit('test+ramen+food+FoodPorn').new()
@@ -283,14 +608,12 @@ def investigate(r, cmt_file, id_file, model_file, subs):
         post_sub = post.subreddit.display_name
 
         # Check for string, make sure have not commented before
-        if 'tonkatsu' in post_title and post.id not in id_dict.keys():
-            print(f'Tonkatsu found in post: {post.id}.')
-            print(f'Post title: "{post.title}".')
-            logging.info(f'Tonktasu found in post: {post.id}.')
-            logging.info(f'Post title: {post.title}')
-
-            # Use Bayesian model to decide if should comment
-            pred = int(predict(post_title, model_file))
+        if 'tonkatsu' in post_title and claim_id(id_dict, post.id):
+            logger.report(f'Tonkatsu found in post: {post.id}.')
+            logger.report(f'Post title: "{post.title}".')
+
+            # Use the model for this subreddit and its threshold to decide
+            pred = predict(post_title, model_file, cache, post_sub)
             act = pred
             if pred:  # Decided to comment
                 if post_sub in subs:
@@ -302,35 +625,20 @@ def investigate(r, cmt_file, id_file, model_file, subs):
             else:  # Decided not to comment
                 msg = 'Post predicted as correct'
 
-            react_to_post(post, pred, act, cmt_file, id_file)
-
-            full_msg = f'{msg}: [{post.id}]({post.permalink})\n"{post.title}"'
-
-            # Send messages notifying decision
-            r.redditor(user_name).message('Tonkatsu Found', full_msg)
-            r.redditor(human_name).message('Tonkatsu Found', full_msg)
-            logging.info('Sent messages.')
+            react_to_post(r, post, pred, act, msg, cmt_file, id_file,
+                          journal)
 
             break  # Don't need to hit twice if "tonkatsu" is repeated
 
-    print('Done scanning.')
-    print(f'Commented on {ct} post{"" if ct == 1 else "s"}.\n')
-    logging.info('Done scanning.')
-    logging.info(f'Commented on {ct} post{"" if ct == 1 else "s"}.')
+    logger.report('Done scanning.')
+    logger.report(f'Commented on {ct} post{"" if ct == 1 else "s"}.')
 
 
 # --------------------------------------------------
-def check_summons(r, cmt_file, id_file):
+def check_summons(r, cmt_file, id_file, id_dict, journal):
     """Check for username mentions / bot summons"""
 
-    user_name = config.username
-    human_name = config.human_acct
-
-    print('Checking for summons...')
-    logging.info('Checking for summons...')
-
-    # Get previously commented on posts
-    id_dict = get_history(id_file)
+    logger.report('Checking for summons...')
 
     # Get bot username mentions
     mentions = r.inbox.mentions()
@@ -342,48 +650,42 @@ def check_summons(r, cmt_file, id_file):
         post_id = parent_id[3:]  # Comments are prefaced with 't3_' or 't1_'
 
         # Check if this summon has been acted upon before
-        if parent_id not in id_dict.keys():
+        with STATE_LOCK:
+            if parent_id in id_dict.keys():
+                continue
 
             # Check if bot has commented on the post itself before
             if post_id in id_dict.keys():
                 if id_dict[post_id] != 0:
                     break
 
-            msg = 'Summon found'
-            print(f'{msg}.')
-            logging.info(f'{msg}.')
-            react_to_summon(r, cmt_file, id_file, mention)
+            # Claim both so the scan phase does not also comment
+            claim_id(id_dict, parent_id, 's')
+            claim_id(id_dict, post_id, 's')
 
-            # Post address, no comment info
-            post_add = re.sub(r'[?]context=\d+', '', mention.context)
-            full_msg = f'{msg}: [{mention.id}]({post_add})\n\n"{mention.body}"'
+        logger.report('Summon found.')
+        react_to_summon(r, cmt_file, id_file, mention, journal)
 
-            # Send messages notifying decision
-            r.redditor(user_name).message('Bot Summoned', full_msg)
-            r.redditor(human_name).message('Bot Summoned', full_msg)
-            logging.info('Sent messages.')
-
-    print('Done checking for summons.\n')
-    logging.info('Done checking for summons.')
+    logger.report('Done checking for summons.')
 
 
 # --------------------------------------------------
-def purge(r, del_file):
+def purge(r, del_file, journal):
     """Go through bot comments and delete downvoted ones"""
 
     user_name = config.username
     user = r.redditor(user_name)
 
+    # Comment id comes first, then the post if the bot removed it
     with open(del_file, 'r') as fh:
-        deleted = fh.read().splitlines()
+        deleted = {line.split('\t')[0] for line in fh.read().splitlines()}
 
-    print('Checking to purge comments... ')
-    logging.info('Scanning bot comments...')
+    logger.report('Checking to purge comments...')
 
     # Go through bot's comments
     for comment in user.comments.new(limit=None):
         if comment.score < -1:
-            delete_comment(r, comment, del_file)
+            delete_comment(r, comment, del_file, journal)
 
     logging.info('Scanning PMs...')
 
@@ -401,10 +703,29 @@ def purge(r, del_file):
             continue
 
         if parent.author == message.author:
-            delete_comment(r, bad_cmt, del_file)
+            delete_comment(r, bad_cmt, del_file, journal)
+
+    logger.report('Done purging.')
+
+
+# --------------------------------------------------
+def run_phases(connect, cmt_file, id_file, del_file, model_file, subs,
+               id_dict, cache, journal, prof):
+    """Scan posts, answer summons and purge comments side by side"""
+
+    # PRAW is not thread-safe, so each phase gets its own reddit instance
+    # and their network waits overlap. Shared state is under STATE_LOCK.
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        phases = [pool.submit(prof.wrap(investigate), connect(), cmt_file,
+                              id_file, model_file, subs, id_dict, cache,
+                              journal),
+                  pool.submit(prof.wrap(check_summons), connect(), cmt_file,
+                              id_file, id_dict, journal),
+                  pool.submit(prof.wrap(purge), connect(), del_file, journal)]
 
-    print('Done purging.')
-    logging.info('Done scanning comments.')
+        # Surface any exception raised inside a phase
+        for phase in phases:
+            phase.result()
 
 
 # --------------------------------------------------
@@ -420,12 +741,12 @@ def main():
     cmt_file = args.comment
     sub_list = args.subs
 
+    prof = profiler.get_profiler(args.profile, args.flame)
+
     # Set up logging configurations, debug or just info
-    logging.basicConfig(
-        filename=log_file,
-        filemode='a',
-        level=logging.DEBUG if args.debug else logging.INFO
-    )
+    logger.setup_logging(log_file, debug=args.debug, max_bytes=args.log_size,
+                         when=args.log_when, backups=args.log_backups,
+                         json_lines=args.json_log, compress=args.log_gzip)
 
     subs = sub_list.split(sep=",")
 
@@ -433,13 +754,37 @@ def main():
     for f in [id_file, del_file, model_file, cmt_file]:
         if not os.path.isfile(f):
             hp.die(f'File: "{f}" not found')
+    prof.mark('setup')
+
+    # Load model up front, cached predictions are only valid for its version
+    routes, version = load_model(model_file)
+    cache = PredictionCache(args.cache, version, args.cache_size)
+    logging.info(f'Subreddit models: {", ".join(routes.names()) or "none"}, '
+                 f'fallback threshold: {routes.fallback.threshold:.3f}.')
+    prof.mark('model')
 
     # Perform the real bot actions
     r = bot_login()  # Create a reddit instance via PRAW
-    investigate(r, cmt_file, id_file, model_file, subs)
-    check_summons(r, cmt_file, id_file)
-    purge(r, del_file)
-    logging.info('Logging off.\n')
+    prof.mark('login')
+
+    # Finish whatever a crashed run left half done, before reading history
+    journal = jn.Journal(args.journal)
+    recover(r, cmt_file, id_file, del_file, journal)
+    prof.mark('recover')
+
+    # Get previously assessed post id's, shared by scan and summon phases
+    id_dict = get_history(id_file)
+    prof.mark('history')
+
+    run_phases(new_reddit, cmt_file, id_file, del_file, model_file, subs,
+               id_dict, cache, journal, prof)
+    prof.mark('phases')
+
+    journal.checkpoint()
+    cache.save()
+    logging.info(f'Prediction cache hit rate: {cache.hit_rate():.1%} '
+                 f'({cache.hits} of {cache.hits + cache.misses}).')
+    logging.info('Logging off.')
 
 
 # --------------------------------------------------
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Author : schackartk
+Purpose: Classify titles from offline reddit submission dumps in bulk
+Date   : 19 October 2026
+"""
+
+import argparse        # Get command line arguments
+import bayes           # My model file
+import helpers as hp   # Custom made helpers
+import io              # Decode decompressed streams
+import json            # Parse dump lines
+import os              # Check for files
+import pickle          # Read pickled model file
+import re              # Regular expressions for keyword prefilter
+import router          # Per-subreddit models
+import time            # Report throughput
+
+from collections import deque
+from multiprocessing import Pool
+from typing import List, NamedTuple
+
+# Model and filters loaded once into each worker process
+WORKER: dict = {}
+
+
+class Args(NamedTuple):
+    """Command-line arguments"""
+    files: List[str]
+    batch: int
+    keyword: str
+    model: str
+    out: str
+    procs: int
+    subs: str
+
+
+# --------------------------------------------------
+def get_args():
+    """Get command-line arguments"""
+    parser = argparse.ArgumentParser(
+        description='Classify titles from reddit dump files',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument(
+        'files',
+        help='Newline-delimited JSON submission dumps (.zst or plain)',
+        metavar='FILE',
+        type=str,
+        nargs='+')
+
+    parser.add_argument(
+        '-b',
+        '--batch',
+        help='Number of matching lines sent to a worker at once',
+        metavar='INT',
+        type=int,
+        default=1000)
+
+    parser.add_argument(
+        '-k',
+        '--keyword',
+        help='Keyword that must appear in the title',
+        metavar='STR',
+        type=str,
+        default='tonkatsu')
+
+    parser.add_argument(
+        '-m',
+        '--model',
+        help='Model or bundle for classifying titles',
+        metavar='PKL',
+        type=str,
+        default='../data/model.pkl')
+
+    parser.add_argument(
+        '-o',
+        '--out',
+        help='Candidate labeled data output file',
+        metavar='FILE',
+        type=str,
+        default='../data/candidates.txt')
+
+    parser.add_argument(
+        '-p',
+        '--procs',
+        help='Number of worker processes',
+        metavar='INT',
+        type=int,
+        default=os.cpu_count())
+
+    parser.add_argument(
+        '-s',
+        '--subreddits',
+        help='Which subreddits to keep',
+        metavar='list',
+        type=str,
+        default='ramen,food,FoodPorn')
+
+    args = parser.parse_args()
+
+    if args.batch < 1:
+        parser.error(f'--batch "{args.batch}" must be greater than 0')
+
+    if args.procs < 1:
+        parser.error(f'--procs "{args.procs}" must be greater than 0')
+
+    return Args(files=args.files, batch=args.batch, keyword=args.keyword,
+                model=args.model, out=args.out, procs=args.procs,
+                subs=args.subreddits)
+
+
+# --------------------------------------------------
+def read_lines(dump_file):
+    """Stream lines of a dump file, decompressing zstd on the fly"""
+
+    if not dump_file.endswith('.zst'):
+        with open(dump_file, encoding='utf-8', errors='replace') as fh:
+            yield from fh
+        return
+
+    try:
+        import zstandard  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        hp.die('Reading .zst files requires the zstandard package.')
+
+    # Pushshift style dumps are written with a long compression window
+    dctx = zstandard.ZstdDecompressor(max_window_size=2**31)
+    with open(dump_file, 'rb') as fh, dctx.stream_reader(fh) as reader:
+        yield from io.TextIOWrapper(reader, encoding='utf-8',
+                                    errors='replace')
+
+
+# --------------------------------------------------
+def init_worker(model_file, subs, keyword):
+    """Load model or bundle and filters once per worker process"""
+
+    with open(model_file, 'rb') as fh:
+        routes = router.make_router(router.read_artifacts(pickle.load(fh)))
+
+    WORKER.update(routes=routes, keyword=keyword.lower(),
+                  subs={sub.lower() for sub in subs})
+
+
+# --------------------------------------------------
+def classify_batch(lines):
+    """Parse, filter and classify a batch of dump lines"""
+
+    posts = []
+    for line in lines:
+        try:
+            post = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+
+        title = post.get('title') or ''
+        sub = post.get('subreddit') or ''
+
+        if sub.lower() in WORKER['subs'] and \
+                WORKER['keyword'] in title.lower():
+            # Collapse tabs and newlines so each title stays on one row
+            posts.append((post.get('id', ''), sub, ' '.join(title.split())))
+
+    if not posts:
+        return []
+
+    # Score titles of each subreddit model together
+    groups: dict = {}
+    for post in posts:
+        name, route = WORKER['routes'].route(post[1])
+        groups.setdefault(name, (route, []))[1].append(post)
+
+    rows = []
+    for (model, vec, threshold), group in groups.values():
+        titles = [bayes.clean_title(title) for _, _, title in group]
+        features, _ = bayes.get_features(titles, vec)
+        preds = model.predict_proba(features)[:, 1] >= threshold
+
+        rows.extend((post_id, int(pred), sub, title)
+                    for (post_id, sub, title), pred in zip(group, preds))
+
+    return rows
+
+
+# --------------------------------------------------
+def get_batches(dump_files, keyword, batch_size, counts):
+    """Yield batches of lines that could contain the keyword"""
+
+    # Cheap substring check so only candidate lines are parsed as JSON
+    prefilter = re.compile(re.escape(keyword), re.IGNORECASE)
+
+    batch = []
+    for dump_file in dump_files:
+        for line in read_lines(dump_file):
+            counts['lines'] += 1
+            if prefilter.search(line):
+                batch.append(line)
+                if len(batch) == batch_size:
+                    yield batch
+                    batch = []
+
+    if batch:
+        yield batch
+
+
+# --------------------------------------------------
+def write_rows(fh, rows):
+    """Write candidate rows in labeled data format"""
+
+    for post_id, label, sub, title in rows:
+        print(f"{post_id}\t{label}\t{sub}\t'{title}'", file=fh)
+
+    return len(rows)
+
+
+# --------------------------------------------------
+def main():
+    """The good stuff"""
+
+    # Retrieve command-line arguments from argparse
+    args = get_args()
+    model_file = args.model
+    subs = args.subs.split(sep=',')
+
+    # Check for files
+    for f in [model_file] + args.files:
+        if not os.path.isfile(f):
+            hp.die(f'File: "{f}" not found')
+
+    start = time.perf_counter()
+    counts = {'lines': 0}
+    n_rows = 0
+
+    # Only a few batches are in flight at once so memory stays flat
+    max_pending = 2 * args.procs
+    pending: deque = deque()
+
+    with Pool(args.procs, initializer=init_worker,
+              initargs=(model_file, subs, args.keyword)) as pool, \
+            open(args.out, 'w') as fh:
+        print('id\tlabel\tsub\ttitle', file=fh)
+
+        batches = get_batches(args.files, args.keyword, args.batch, counts)
+        for batch in batches:
+            pending.append(pool.apply_async(classify_batch, (batch,)))
+            if len(pending) >= max_pending:
+                n_rows += write_rows(fh, pending.popleft().get())
+
+        while pending:
+            n_rows += write_rows(fh, pending.popleft().get())
+
+    elapsed = time.perf_counter() - start
+    rate = counts['lines'] / elapsed * 3600
+    print(f'Scanned {counts["lines"]} lines ({rate:,.0f} per hour).')
+    print(f'Wrote {n_rows} candidate row{"" if n_rows == 1 else "s"} '
+          f'to "{args.out}" in {elapsed:.1f} seconds.')
+
+
+# --------------------------------------------------
+if __name__ == '__main__':
+    main()
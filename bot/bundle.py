@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Author : schackartk
+Purpose: Train one compact model per subreddit, plus a global fallback
+Date   : 19 October 2026
+"""
+
+import argparse        # Get command line arguments
+import bayes           # My model file
+import compact         # Prune uninformative features
+import helpers as hp   # Custom made helpers
+import os              # Check for files
+import pandas as pd    # Read csv as panda data frame
+import pickle          # Save bundle
+import roc             # Threshold sweep
+import search          # Shared train/test splits
+
+from sklearn.model_selection import train_test_split
+from typing import NamedTuple
+
+
+class Args(NamedTuple):
+    """Command-line arguments"""
+    alpha: float
+    data: str
+    fn_cost: float
+    fp_cost: float
+    half: bool
+    min_titles: int
+    ngrams: int
+    out: str
+    runs: int
+    seed: int
+    subs: str
+    split: float
+    threshold: float
+
+
+# --------------------------------------------------
+def get_args():
+    """Get command-line arguments"""
+    parser = argparse.ArgumentParser(
+        description='Train a bundle of per-subreddit bayesian models',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument(
+        '-a',
+        '--alpha',
+        help='Additive smoothing parameter of the models',
+        metavar='FLOAT',
+        type=float,
+        default=1.0)
+
+    parser.add_argument(
+        '-d',
+        '--data',
+        help='Labeled data file',
+        metavar='FILE',
+        type=str,
+        default='../data/all_labeled_data.txt')
+
+    parser.add_argument(
+        '-f',
+        '--fp_cost',
+        help='Cost of commenting on a correct title, for thresholds',
+        metavar='FLOAT',
+        type=float,
+        default=1.0)
+
+    parser.add_argument(
+        '-H',
+        '--float16',
+        help='Store feature weights as float16',
+        action='store_true')
+
+    parser.add_argument(
+        '-N',
+        '--fn_cost',
+        help='Cost of missing a misspelled title, for thresholds',
+        metavar='FLOAT',
+        type=float,
+        default=1.0)
+
+    parser.add_argument(
+        '-M',
+        '--min_titles',
+        help='Fewest titles a subreddit needs for its own model',
+        metavar='INT',
+        type=int,
+        default=50)
+
+    parser.add_argument(
+        '-n',
+        '--ngrams',
+        help='Longest word n-gram used as a feature',
+        metavar='INT',
+        type=int,
+        default=1)
+
+    parser.add_argument(
+        '-o',
+        '--out',
+        help='Bundle output (pickle)',
+        metavar='PKL',
+        type=str,
+        default='../data/model_bundle.pkl')
+
+    parser.add_argument(
+        '-R',
+        '--runs',
+        help='Number of random train/test splits used to choose thresholds',
+        metavar='INT',
+        type=int,
+        default=20)
+
+    parser.add_argument(
+        '-e',
+        '--seed',
+        help='Random seed for the train/test split',
+        metavar='INT',
+        type=int,
+        default=0)
+
+    parser.add_argument(
+        '-s',
+        '--subreddits',
+        help='Which subreddits to train on',
+        metavar='list',
+        type=str,
+        default='ramen,food,FoodPorn')
+
+    parser.add_argument(
+        '-r',
+        '--test_split',
+        help='Test data split ratio',
+        metavar='FLOAT',
+        type=float,
+        default=0.2)
+
+    parser.add_argument(
+        '-t',
+        '--threshold',
+        help='Minimum absolute log-probability ratio to keep a feature',
+        metavar='FLOAT',
+        type=float,
+        default=0.5)
+
+    args = parser.parse_args()
+
+    if args.ngrams < 1:
+        parser.error(f'--ngrams "{args.ngrams}" must be greater than 0')
+
+    if args.runs < 1:
+        parser.error(f'--runs "{args.runs}" must be greater than 0')
+
+    return Args(alpha=args.alpha, data=args.data, fn_cost=args.fn_cost,
+                fp_cost=args.fp_cost, half=args.float16,
+                min_titles=args.min_titles, ngrams=args.ngrams,
+                out=args.out, runs=args.runs, seed=args.seed,
+                subs=args.subreddits, split=args.test_split,
+                threshold=args.threshold)
+
+
+# --------------------------------------------------
+def train_route(titles, y_train, args):
+    """Compact model and vectorizer for one route"""
+
+    x_train, vec = bayes.get_features(titles, None, args.ngrams)
+    model = bayes.generate_model(x_train, y_train, args.alpha)
+
+    # A tiny subreddit may have no feature above threshold, keep it whole
+    keep = compact.informative_features(model, args.threshold)
+    if len(keep) == 0:
+        return model, vec
+
+    return compact.prune_model(model, vec, keep, args.half)
+
+
+# --------------------------------------------------
+def choose_threshold(train, subs, args):
+    """Threshold for a route, swept over compacted models of its splits"""
+
+    config = search.VecConfig(args.ngrams, False, tuple(subs))
+    built = search.build_matrices(train, config, args.runs, args.split,
+                                  args.seed)
+
+    # A small subreddit's split may hold only one label, it can't be scored
+    splits = [split for split in built['splits'] if len(set(split[2])) > 1]
+    if not splits:
+        return bayes.DEFAULT_THRESHOLD
+
+    labels, scores = compact.pruned_scores(splits, args.alpha,
+                                           args.threshold, args.half)
+    curve = roc.sweep(labels, scores, args.fp_cost, args.fn_cost)
+
+    return float(curve['thresholds'][curve['best']])
+
+
+# --------------------------------------------------
+def model_tuple(route, t_test, y_test, threshold):
+    """Model tuple in bayes.py format, tested on the given titles"""
+
+    model, vec = route
+    x_test, _ = bayes.get_features(t_test, vec)
+
+    # Saved accuracy is model.score, which loading checks against
+    return (model, x_test, y_test, model.score(x_test, y_test), vec,
+            threshold)
+
+
+# --------------------------------------------------
+def route_accuracy(route_tuple):
+    """Test accuracy of a model tuple, scored the way bot.py decides"""
+
+    model, x_test, y_test, _, _, threshold = route_tuple
+
+    return bayes.threshold_accuracy(model, x_test, y_test, threshold)
+
+
+# --------------------------------------------------
+def main():
+    """The good stuff"""
+
+    # Retrieve command-line arguments from argparse
+    args = get_args()
+
+    # Check for data file
+    if not os.path.isfile(args.data):
+        hp.die(f'Data file "{args.data}" not found.')
+
+    raw_data = pd.read_csv(args.data, delimiter='\t', header=0)
+    subs = args.subs.split(sep=',')
+    data = bayes.filt_subs(raw_data, subs).reset_index(drop=True)
+    data['clean'] = [bayes.clean_title(title) for title in data.title]
+
+    # One split shared by all routes, so they are compared on equal terms
+    train, test = train_test_split(data, test_size=args.split,
+                                   random_state=args.seed)
+
+    # Thresholds are chosen on training titles only, test titles stay unseen
+    print('Training fallback on all subreddits')
+    fallback = train_route(list(train.clean), train.label, args)
+    fallback_threshold = choose_threshold(train, subs, args)
+    bundle = {'fallback': model_tuple(fallback, list(test.clean),
+                                      test.label, fallback_threshold),
+              'subs': {}}
+
+    print(f'{"Subreddit":12}{"Titles":>8}{"Features":>10}{"Threshold":>11}'
+          f'{"Own":>8}{"Fallback":>10}  Route')
+    for sub in subs:
+        sub_train = train[train['sub'] == sub]
+        sub_test = test[test['sub'] == sub]
+        n_titles = len(sub_train) + len(sub_test)
+
+        # Too few titles, or only one label, can't make a useful model
+        if n_titles < args.min_titles or sub_train.label.nunique() < 2 or \
+                sub_test.empty:
+            print(f'{sub:12}{n_titles:>8}{"":>39}  fallback')
+            continue
+
+        route = train_route(list(sub_train.clean), sub_train.label, args)
+        threshold = choose_threshold(train, [sub], args)
+        own = model_tuple(route, list(sub_test.clean), sub_test.label,
+                          threshold)
+        shared = model_tuple(fallback, list(sub_test.clean), sub_test.label,
+                             fallback_threshold)
+
+        # Only route to a model that does at least as well as the fallback
+        own_acc, shared_acc = route_accuracy(own), route_accuracy(shared)
+        use_own = own_acc >= shared_acc
+        if use_own:
+            bundle['subs'][sub] = own
+
+        print(f'{sub:12}{n_titles:>8}{own[0].n_features_in_:>10}'
+              f'{threshold:>11.3f}{own_acc:>8.1%}{shared_acc:>10.1%}  '
+              f'{"own" if use_own else "fallback"}')
+
+    print(f'Fallback accuracy: {route_accuracy(bundle["fallback"]):.1%} '
+          f'at threshold {fallback_threshold:.3f}')
+
+    with open(args.out, 'wb') as fh:
+        pickle.dump(bundle, fh)
+
+    print(f'Saved bundle of {len(bundle["subs"])} subreddit model'
+          f'{"" if len(bundle["subs"]) == 1 else "s"} and fallback to '
+          f'"{args.out}" ({os.path.getsize(args.out) / 1e3:.1f} kB).')
+
+
+# --------------------------------------------------
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Author : schackartk
+Purpose: Persistent LRU cache of title predictions
+Date   : 19 October 2026
+"""
+
+import json            # Cache file format
+import os              # Atomic replacement of cache file
+import threading       # Guard cache across bot phases
+
+from collections import OrderedDict
+
+
+class PredictionCache:
+    """Size-bounded LRU cache of predictions for one model version"""
+
+    def __init__(self, cache_file, version, max_size=10000):
+        self.cache_file = cache_file
+        self.version = version
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        if os.path.isfile(cache_file):
+            with open(cache_file, 'r') as fh:
+                saved = json.load(fh)
+
+            # Predictions from any other model are stale, so start over
+            if saved.get('version') == version:
+                self._entries.update(saved['entries'][-max_size:])
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Get cached prediction, or None if not cached"""
+
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._entries.move_to_end(key)
+
+            return self._entries[key]
+
+    def put(self, key, pred):
+        """Cache prediction, evicting least recently used if full"""
+
+        with self._lock:
+            self._entries[key] = pred
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def hit_rate(self):
+        """Fraction of lookups answered from the cache"""
+
+        lookups = self.hits + self.misses
+
+        return self.hits / lookups if lookups else 0.0
+
+    def save(self):
+        """Write cache to file, oldest entries first"""
+
+        tmp_file = f'{self.cache_file}.tmp'
+
+        with self._lock, open(tmp_file, 'w') as fh:
+            json.dump({'version': self.version,
+                       'entries': list(self._entries.items())}, fh)
+
+        # Replace in one step so a crash never leaves a partial cache
+        os.replace(tmp_file, self.cache_file)
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Author : schackartk
+Purpose: Prune uninformative features from a model made by bayes.py
+Date   : 19 October 2026
+"""
+
+import argparse        # Get command line arguments
+import bayes           # Model artifact format
+import copy            # Leave the full model untouched
+import helpers as hp   # Custom made helpers
+import numpy as np     # Feature weight arithmetic
+import os              # Check for files
+import pandas as pd    # Read csv as panda data frame
+import pickle          # Read and write pickled model files
+import roc             # Threshold sweep
+import search          # Shared train/test splits
+import time            # Time model loading
+
+from typing import NamedTuple
+
+
+class Args(NamedTuple):
+    """Command-line arguments"""
+    model: str
+    out: str
+    threshold: float
+    half: bool
+    reps: int
+    data: str
+    fp_cost: float
+    fn_cost: float
+    runs: int
+    seed: int
+    subs: str
+    split: float
+
+
+# --------------------------------------------------
+def get_args():
+    """Get command-line arguments"""
+    parser = argparse.ArgumentParser(
+        description='Compact a bayesian model by pruning features',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument(
+        '-m',
+        '--model',
+        help='Full model made by bayes.py',
+        metavar='PKL',
+        type=str,
+        default='../data/model.pkl')
+
+    parser.add_argument(
+        '-o',
+        '--out',
+        help='Compacted model output (pickle)',
+        metavar='PKL',
+        type=str,
+        default='../data/model_compact.pkl')
+
+    parser.add_argument(
+        '-t',
+        '--threshold',
+        help='Minimum absolute log-probability ratio to keep a feature',
+        metavar='FLOAT',
+        type=float,
+        default=0.5)
+
+    parser.add_argument(
+        '-H',
+        '--float16',
+        help='Store remaining feature weights as float16',
+        action='store_true')
+
+    parser.add_argument(
+        '-n',
+        '--reps',
+        help='Number of loads used to time each model',
+        metavar='INT',
+        type=int,
+        default=20)
+
+    parser.add_argument(
+        '-d',
+        '--data',
+        help='Labeled data file, for choosing the threshold',
+        metavar='FILE',
+        type=str,
+        default='../data/all_labeled_data.txt')
+
+    parser.add_argument(
+        '-f',
+        '--fp_cost',
+        help='Cost of commenting on a correct title',
+        metavar='FLOAT',
+        type=float,
+        default=1.0)
+
+    parser.add_argument(
+        '-N',
+        '--fn_cost',
+        help='Cost of missing a misspelled title',
+        metavar='FLOAT',
+        type=float,
+        default=1.0)
+
+    parser.add_argument(
+        '-R',
+        '--runs',
+        help='Number of random train/test splits used to choose threshold',
+        metavar='INT',
+        type=int,
+        default=20)
+
+    parser.add_argument(
+        '-e',
+        '--seed',
+        help='Random seed for splits',
+        metavar='INT',
+        type=int,
+        default=0)
+
+    parser.add_argument(
+        '-s',
+        '--subreddits',
+        help='Which subreddits to train on',
+        metavar='list',
+        type=str,
+        default='ramen,food,FoodPorn')
+
+    parser.add_argument(
+        '-r',
+        '--test_split',
+        help='Test data split ratio',
+        metavar='FLOAT',
+        type=float,
+        default=0.2)
+
+    args = parser.parse_args()
+
+    if args.reps < 1:
+        parser.error(f'--reps "{args.reps}" must be greater than 0')
+
+    if args.runs < 1:
+        parser.error(f'--runs "{args.runs}" must be greater than 0')
+
+    return Args(model=args.model, out=args.out, threshold=args.threshold,
+                half=args.float16, reps=args.reps, data=args.data,
+                fp_cost=args.fp_cost, fn_cost=args.fn_cost, runs=args.runs,
+                seed=args.seed, subs=args.subreddits, split=args.test_split)
+
+
+# --------------------------------------------------
+def informative_features(model, threshold):
+    """Get indices of features whose class log-ratio meets threshold"""
+
+    # With two classes the log-ratio is the weight a word adds to a title
+    log_ratio = model.feature_log_prob_[1] - model.feature_log_prob_[0]
+
+    return np.flatnonzero(np.abs(log_ratio) >= threshold)
+
+
+# --------------------------------------------------
+def prune_weights(model, keep, half):
+    """Copy model, keeping only the weights of features in keep"""
+
+    small_model = copy.deepcopy(model)
+
+    weights = model.feature_log_prob_[:, keep]
+    small_model.feature_log_prob_ = weights.astype(
+        np.float16 if half else weights.dtype)
+    small_model.feature_count_ = model.feature_count_[:, keep]
+    small_model.n_features_in_ = len(keep)
+
+    return small_model
+
+
+# --------------------------------------------------
+def pruned_scores(splits, alpha, threshold, half):
+    """Labels and positive class probabilities of pruned models per split"""
+
+    labels, scores = [], []
+    for x_train, x_test, y_train, y_test in splits:
+        model = bayes.generate_model(x_train, y_train, alpha)
+
+        # Scored as the pruned model will be, kept whole if nothing is left
+        keep = informative_features(model, threshold)
+        if len(keep) > 0:
+            model = prune_weights(model, keep, half)
+            x_test = x_test[:, keep]
+
+        labels.append(y_test)
+        scores.append(model.predict_proba(x_test)[:, 1])
+
+    return np.concatenate(labels), np.concatenate(scores)
+
+
+# --------------------------------------------------
+def prune_model(model, vec, keep, half):
+    """Copy model and vectorizer, keeping only features in keep"""
+
+    small_model = prune_weights(model, keep, half)
+    small_vec = copy.deepcopy(vec)
+
+    # Renumber kept terms so they line up with the remaining columns
+    terms = sorted(vec.vocabulary_, key=vec.vocabulary_.get)
+    small_vec.vocabulary_ = {terms[i]: new for new, i in enumerate(keep)}
+
+    # Only needed for introspection, and can be as big as the vocabulary
+    if hasattr(small_vec, 'stop_words_'):
+        small_vec.stop_words_ = set()
+
+    return small_model, small_vec
+
+
+# --------------------------------------------------
+def load_time(pkl_file, reps):
+    """Average time to unpickle a model file"""
+
+    start = time.perf_counter()
+    for _ in range(reps):
+        with open(pkl_file, 'rb') as fh:
+            pickle.load(fh)
+
+    return (time.perf_counter() - start) / reps
+
+
+# --------------------------------------------------
+def main():
+    """The good stuff"""
+
+    # Retrieve command-line arguments from argparse
+    args = get_args()
+    model_file = args.model
+    out_file = args.out
+
+    for f, kind in [(args.data, 'Data'), (model_file, 'Model')]:
+        if not os.path.isfile(f):
+            hp.die(f'{kind} file "{f}" not found.')
+
+    # Unpickle Bayesian model file, made by bayes.py
+    with open(model_file, 'rb') as fh:
+        artifact = pickle.load(fh)
+
+    if isinstance(artifact, dict):
+        hp.die(f'"{model_file}" is a bundle, bundle.py compacts its models.')
+
+    model, x_test, y_test, _, vec, threshold = bayes.unpack_model(artifact)
+
+    keep = informative_features(model, args.threshold)
+    if len(keep) == 0:
+        hp.die(f'No features meet threshold {args.threshold}.')
+
+    small_model, small_vec = prune_model(model, vec, keep, args.half)
+
+    # Test data must match the pruned columns for bot.py's accuracy check
+    small_x_test = x_test[:, keep]
+    small_accuracy = small_model.score(small_x_test, y_test)
+
+    # Pruning shifts probabilities, so sweep models pruned just the same
+    raw_data = pd.read_csv(args.data, delimiter='\t', header=0)
+    config = search.VecConfig(vec.ngram_range[1], False,
+                              tuple(args.subs.split(sep=',')))
+    built = search.build_matrices(raw_data, config, args.runs, args.split,
+                                  args.seed)
+    curve = roc.sweep(*pruned_scores(built['splits'], model.alpha,
+                                     args.threshold, args.half),
+                      args.fp_cost, args.fn_cost)
+    small_threshold = float(curve['thresholds'][curve['best']])
+
+    print('Saving pickle')
+    pickle_tuple = (small_model, small_x_test, y_test, small_accuracy,
+                    small_vec, small_threshold)
+    with open(out_file, 'wb') as fh:
+        pickle.dump(pickle_tuple, fh)
+
+    full_size = os.path.getsize(model_file)
+    small_size = os.path.getsize(out_file)
+    full_load = load_time(model_file, args.reps)
+    small_load = load_time(out_file, args.reps)
+    n_feats = model.feature_log_prob_.shape[1]
+
+    # Scored as bot.py decides, at the threshold saved in each model
+    full_acc = bayes.threshold_accuracy(model, x_test, y_test, threshold)
+    small_acc = bayes.threshold_accuracy(small_model, small_x_test, y_test,
+                                         small_threshold)
+
+    print(f'{"":10}{"Full":>12}{"Compact":>12}{"Change":>12}')
+    print(f'{"Features":10}{n_feats:>12}{len(keep):>12}'
+          f'{len(keep) / n_feats - 1:>12.1%}')
+    print(f'{"Size (kB)":10}{full_size / 1e3:>12.1f}{small_size / 1e3:>12.1f}'
+          f'{small_size / full_size - 1:>12.1%}')
+    print(f'{"Load (ms)":10}{full_load * 1e3:>12.3f}{small_load * 1e3:>12.3f}'
+          f'{small_load / full_load - 1:>12.1%}')
+    print(f'{"Threshold":10}{threshold:>12.3f}{small_threshold:>12.3f}'
+          f'{small_threshold - threshold:>+12.3f}')
+    print(f'{"Accuracy":10}{full_acc:>12.1%}{small_acc:>12.1%}'
+          f'{small_acc - full_acc:>+12.1%}')
+
+
+# --------------------------------------------------
+if __name__ == '__main__':
+    main()
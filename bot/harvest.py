@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Author : schackartk
+Purpose: Turn bot history and deletions into new labeled data
+Date   : 19 October 2026
+"""
+
+import argparse        # Get command line arguments
+import bayes           # Title cleaning shared with model
+import hashlib         # Compact title fingerprints
+import helpers as hp   # Custom made helpers
+import os              # Check for files
+
+from typing import NamedTuple
+
+
+class Args(NamedTuple):
+    """Command-line arguments"""
+    all: bool
+    data: str
+    deleted: str
+    out: str
+    posts: str
+
+
+# --------------------------------------------------
+def get_args():
+    """Get command-line arguments"""
+    parser = argparse.ArgumentParser(
+        description='Harvest labeled data from bot history',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument(
+        '-a',
+        '--all',
+        help='Also label uncommented posts with their prediction',
+        action='store_true')
+
+    parser.add_argument(
+        '-d',
+        '--data',
+        help='Labeled data file',
+        metavar='FILE',
+        type=str,
+        default='../data/all_labeled_data.txt')
+
+    parser.add_argument(
+        '-D',
+        '--deleted',
+        help='Deleted comments file',
+        metavar='FILE',
+        type=str,
+        default='../data/deleted.txt')
+
+    parser.add_argument(
+        '-o',
+        '--out',
+        help='File to append new rows to (default: --data)',
+        metavar='FILE',
+        type=str,
+        default='')
+
+    parser.add_argument(
+        '-p',
+        '--posts',
+        help='Previously assessed posts file',
+        metavar='FILE',
+        type=str,
+        default='../data/id_file.txt')
+
+    args = parser.parse_args()
+
+    return Args(all=args.all, data=args.data, deleted=args.deleted,
+                out=args.out or args.data, posts=args.posts)
+
+
+# --------------------------------------------------
+def read_rows(tsv_file, header=True):
+    """Stream tab separated rows, skipping the header if there is one"""
+
+    with open(tsv_file, 'r') as fh:
+        if header:
+            next(fh, None)
+        for line in fh:
+            yield line.rstrip('\n').split('\t')
+
+
+# --------------------------------------------------
+def post_key(post_id):
+    """Reddit base36 id as an int, smaller than the string in a set"""
+
+    try:
+        return int(post_id, 36)
+    except ValueError:
+        return post_id
+
+
+# --------------------------------------------------
+def title_key(title):
+    """Fingerprint of cleaned title, equal for near-duplicate titles"""
+
+    cleaned = bayes.clean_title(title.strip("'"))
+    digest = hashlib.blake2b(cleaned.encode(), digest_size=8).digest()
+
+    return int.from_bytes(digest, 'big')
+
+
+# --------------------------------------------------
+def get_label(pred, com, removed, keep_all):
+    """Label from prediction and community feedback, or None"""
+
+    if com == '1':
+        # Downvoted or deleted on request means the spelling was right
+        return 0 if removed else 1
+
+    return int(pred) if keep_all and pred in ['0', '1'] else None
+
+
+# --------------------------------------------------
+def harvest(posts_file, removed, seen_ids, seen_titles, keep_all):
+    """Yield new labeled rows from bot history in one pass"""
+
+    for row in read_rows(posts_file):
+        if len(row) != 5:
+            continue
+
+        post_id, pred, com, sub, title = row
+        if not sub or title in ['', 'NA']:
+            continue  # Summons and early rows have no title
+
+        key = post_key(post_id)
+        if key in seen_ids:
+            continue
+
+        label = get_label(pred, com, key in removed, keep_all)
+        if label is None:
+            continue
+
+        t_key = title_key(title)
+        if t_key in seen_titles:
+            continue
+
+        seen_ids.add(key)
+        seen_titles.add(t_key)
+
+        yield post_id, label, sub, title.strip("'")
+
+
+# --------------------------------------------------
+def ends_in_newline(file_name):
+    """Whether a file is empty or its last line is terminated"""
+
+    with open(file_name, 'rb') as fh:
+        if fh.seek(0, os.SEEK_END) == 0:
+            return True
+        fh.seek(-1, os.SEEK_END)
+        return fh.read(1) == b'\n'
+
+
+# --------------------------------------------------
+def main():
+    """The good stuff"""
+
+    # Retrieve command-line arguments from argparse
+    args = get_args()
+
+    # Check for files
+    for f in [args.data, args.deleted, args.posts]:
+        if not os.path.isfile(f):
+            hp.die(f'File: "{f}" not found')
+
+    # Posts the bot removed its comment from, only rows with a post id
+    removed = {post_key(row[1])
+               for row in read_rows(args.deleted, header=False)
+               if len(row) > 1}
+
+    # Everything already labeled, by id and by cleaned title
+    seen_ids = set()
+    seen_titles = set()
+    for row in read_rows(args.data):
+        if len(row) == 4:
+            seen_ids.add(post_key(row[0]))
+            seen_titles.add(title_key(row[3]))
+
+    n_rows = 0
+    new_file = not os.path.isfile(args.out)
+    with open(args.out, 'a') as fh:
+        if new_file:
+            print('id\tlabel\tsub\ttitle', file=fh)
+        elif not ends_in_newline(args.out):
+            print(file=fh)  # Else the first new row joins the last old one
+
+        for post_id, label, sub, title in harvest(args.posts, removed,
+                                                  seen_ids, seen_titles,
+                                                  args.all):
+            print(f"{post_id}\t{label}\t{sub}\t'{title}'", file=fh)
+            n_rows += 1
+
+    print(f'Appended {n_rows} new row{"" if n_rows == 1 else "s"} '
+          f'to "{args.out}".')
+
+
+# --------------------------------------------------
+if __name__ == '__main__':
+    main()
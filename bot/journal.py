@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Author : schackartk
+Purpose: Write-ahead journal of bot actions for crash recovery
+Date   : 19 October 2026
+"""
+
+import json            # Journal line format
+import os              # Flush journal to disk
+import threading       # Serialize writes across bot phases
+import uuid            # Entry ids
+
+
+class Journal:
+    """Append-only record of actions begun, their steps and completion"""
+
+    def __init__(self, journal_file):
+        self.journal_file = journal_file
+        self._lock = threading.Lock()
+
+    def _write(self, line):
+        """Append line and make sure it is on disk before acting"""
+
+        with self._lock, open(self.journal_file, 'a') as fh:
+            print(json.dumps(line), file=fh)
+            fh.flush()
+            os.fsync(fh.fileno())
+
+    def begin(self, action, **data):
+        """Record intent to perform action, before any of it is done"""
+
+        entry = {'id': uuid.uuid4().hex, 'action': action, 'data': data,
+                 'steps': {}}
+        self._write({'op': 'begin', 'id': entry['id'], 'action': action,
+                     'data': data})
+
+        return entry
+
+    def step(self, entry, name, **data):
+        """Record a step of an action"""
+
+        entry['steps'][name] = data
+        self._write({'op': 'step', 'id': entry['id'], 'step': name,
+                     'data': data})
+
+    def done(self, entry):
+        """Record that every step of an action is complete"""
+
+        self._write({'op': 'done', 'id': entry['id']})
+
+    def pending(self):
+        """Actions begun but not completed, oldest first"""
+
+        entries = {}
+
+        if not os.path.isfile(self.journal_file):
+            return []
+
+        with open(self.journal_file, 'r') as fh:
+            for line in fh:
+                try:
+                    rec = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Torn write from a crash, nothing was done
+
+                if rec['op'] == 'begin':
+                    entries[rec['id']] = {'id': rec['id'],
+                                          'action': rec['action'],
+                                          'data': rec['data'], 'steps': {}}
+                elif rec['op'] == 'step' and rec['id'] in entries:
+                    entries[rec['id']]['steps'][rec['step']] = rec['data']
+                elif rec['op'] == 'done':
+                    entries.pop(rec['id'], None)
+
+        return list(entries.values())
+
+    def checkpoint(self):
+        """Empty journal if nothing is in flight, so replay stays short"""
+
+        with self._lock:
+            if self.pending():
+                return False
+
+            open(self.journal_file, 'w').close()
+
+        return True
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Author : schackartk
+Purpose: Non-blocking, rotating log set up for bot
+Date   : 19 October 2026
+"""
+
+import atexit          # Flush queued events however the run ends
+import gzip            # Compress rotated logs
+import json            # JSON lines log format
+import logging         # Generate log of activity
+import os              # Remove uncompressed rotated logs
+import queue           # Hand events to the writer thread
+import shutil          # Copy into compressed file
+import sys             # Console output
+
+from logging.handlers import (QueueHandler, QueueListener,
+                              RotatingFileHandler, TimedRotatingFileHandler)
+
+TEXT_FORMAT = '%(asctime)s %(levelname)s [%(threadName)s] %(message)s'
+
+
+class LocalQueueHandler(QueueHandler):
+    """Queue records as they are, leaving all formatting to the listener"""
+
+    def prepare(self, record):
+        # Records never leave the process, so no need to copy and flatten
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line"""
+
+    def format(self, record):
+        return json.dumps({'time': self.formatTime(record),
+                           'level': record.levelname,
+                           'thread': record.threadName,
+                           'msg': record.getMessage()})
+
+
+# --------------------------------------------------
+def gzip_rotator(source, dest):
+    """Compress a log file as it is rotated out"""
+
+    with open(source, 'rb') as f_in, gzip.open(dest, 'wb') as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+# --------------------------------------------------
+def setup_logging(log_file, debug=False, max_bytes=1000000, when='',
+                  backups=5, json_lines=False, compress=False):
+    """Send log events through a queue to console and rotating file"""
+
+    # Rotate by time if given, otherwise by size
+    if when:
+        file_handler = TimedRotatingFileHandler(log_file, when=when,
+                                                backupCount=backups)
+    else:
+        file_handler = RotatingFileHandler(log_file, maxBytes=max_bytes,
+                                           backupCount=backups)
+
+    if compress:
+        file_handler.namer = lambda name: f'{name}.gz'
+        file_handler.rotator = gzip_rotator
+
+    file_handler.setFormatter(JsonFormatter() if json_lines
+                              else logging.Formatter(TEXT_FORMAT))
+
+    # Only events sent with report() are echoed to the console
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.addFilter(lambda record: getattr(record, 'console',
+                                                     False))
+
+    # The calling thread only enqueues, all file I/O happens in the listener
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, file_handler, console_handler,
+                             respect_handler_level=True)
+
+    root = logging.getLogger()
+    root.handlers = [LocalQueueHandler(log_queue)]
+    root.setLevel(logging.DEBUG if debug else logging.INFO)
+
+    listener.start()
+    atexit.register(listener.stop)
+
+    return listener
+
+
+# --------------------------------------------------
+def report(msg, level=logging.INFO):
+    """Log event and show it on the console"""
+
+    logging.log(level, msg, extra={'console': True})
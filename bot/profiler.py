@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Author : schackartk
+Purpose: Optional profiling of bot.py and bayes.py runs
+Date   : 19 October 2026
+"""
+
+import atexit          # Write results however the run ends
+import cProfile        # Deterministic function profiling
+import os              # File names in stacks
+import pstats          # Summarize profile
+import sys             # Python version and thread frames
+import threading       # Profile phases and sample stacks
+import time            # Time phases
+import tracemalloc     # Memory peaks
+
+from collections import Counter
+
+
+# --------------------------------------------------
+def get_profiler(prefix, flame=False):
+    """Profiler writing to files starting with prefix, if given"""
+
+    return Profiler(prefix, flame) if prefix else NullProfiler()
+
+
+class NullProfiler:
+    """Stand-in used when profiling is off, so it costs nothing"""
+
+    def mark(self, label):
+        """Do nothing"""
+
+    def wrap(self, func):
+        """Return func as is"""
+
+        return func
+
+
+class Profiler:
+    """cProfile, tracemalloc and optional stack sampling for one run"""
+
+    def __init__(self, prefix, flame=False, interval=0.001):
+        self.prefix = prefix
+        self.interval = interval
+
+        # CPU used before profiling starts is almost all imports
+        self.phases = [('startup (cpu)', time.process_time(), 0, 0)]
+        self._last = time.perf_counter()
+        self._lock = threading.Lock()
+        self._thread_profiles = []
+        self._stacks = Counter()
+        self._done = threading.Event()
+        self._sampler = None
+
+        if flame:
+            self._sampler = threading.Thread(target=self._sample, daemon=True)
+            self._sampler.start()
+
+        tracemalloc.start()
+        self._profile = cProfile.Profile()
+        atexit.register(self.stop)
+        self._profile.enable()
+
+    def mark(self, label):
+        """Record time and memory of phase ending now"""
+
+        now = time.perf_counter()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        self.phases.append((label, now - self._last, current, peak))
+        self._last = now
+
+    def wrap(self, func):
+        """Make func profiled when run in another thread"""
+
+        # From 3.12 only one profiler may be active per process. The main
+        # one counts calls from every thread, but its times for overlapping
+        # threads are unreliable, so use the flame graph stacks there
+        if sys.version_info >= (3, 12):
+            return func
+
+        def profiled(*args, **kwargs):
+            prof = cProfile.Profile()
+            try:
+                return prof.runcall(func, *args, **kwargs)
+            finally:
+                with self._lock:
+                    self._thread_profiles.append(prof)
+
+        return profiled
+
+    def _sample(self):
+        """Count stacks of other threads for a flame graph"""
+
+        own_id = threading.get_ident()
+
+        while not self._done.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+
+                stack = []
+                while frame:
+                    code = frame.f_code
+                    stack.append(f'{code.co_name} '
+                                 f'({os.path.basename(code.co_filename)}'
+                                 f':{code.co_firstlineno})')
+                    frame = frame.f_back
+
+                self._stacks[';'.join(reversed(stack))] += 1
+
+    def stop(self):
+        """Stop profiling and write results"""
+
+        if self._done.is_set():
+            return
+
+        self._profile.disable()
+        self._done.set()
+        if self._sampler:
+            self._sampler.join()
+
+        self.mark('end')
+        tracemalloc.stop()
+
+        stats = pstats.Stats(self._profile)
+        for prof in self._thread_profiles:
+            stats.add(prof)
+        stats.dump_stats(f'{self.prefix}.pstats')
+
+        with open(f'{self.prefix}.txt', 'w') as fh:
+            print(f'{"Phase":20}{"Seconds":>10}{"Mem (MB)":>10}'
+                  f'{"Peak (MB)":>10}', file=fh)
+            for label, secs, current, peak in self.phases:
+                print(f'{label:20}{secs:>10.3f}{current / 1e6:>10.2f}'
+                      f'{peak / 1e6:>10.2f}', file=fh)
+            print(file=fh)
+
+            stats.stream = fh
+            stats.sort_stats('tottime').print_stats()
+
+        if self._sampler:
+            with open(f'{self.prefix}.collapsed', 'w') as fh:
+                for stack, count in self._stacks.most_common():
+                    print(f'{stack} {count}', file=fh)
+
+        print(f'Profile written to "{self.prefix}.*"', file=sys.stderr)
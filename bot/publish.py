@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Author : schackartk
+Purpose: Benchmark a retrained model and publish it only within budgets
+Date   : 19 October 2026
+"""
+
+import argparse        # Get command line arguments
+import bayes           # My model file
+import harvest         # Stream bot history
+import helpers as hp   # Custom made helpers
+import numpy as np     # Latency percentiles
+import os              # Check for and replace files
+import pandas as pd    # Read csv as panda data frame
+import pickle          # Read model artifacts
+import router          # Models and bundles alike
+import shutil          # Copy model files
+import time            # Time loading and scoring
+
+from collections import deque
+from typing import NamedTuple
+
+
+class Args(NamedTuple):
+    """Command-line arguments"""
+    accuracy_drop: float
+    candidate: str
+    data: str
+    dry_run: bool
+    latency_ratio: float
+    load_ratio: float
+    model: str
+    posts: str
+    recent: int
+    reps: int
+    size_ratio: float
+
+
+# --------------------------------------------------
+def get_args():
+    """Get command-line arguments"""
+    parser = argparse.ArgumentParser(
+        description='Benchmark a candidate model and publish it',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument(
+        'candidate',
+        help='Candidate model or bundle',
+        metavar='PKL',
+        type=str)
+
+    parser.add_argument(
+        '-a',
+        '--accuracy_drop',
+        help='Largest allowed drop in accuracy',
+        metavar='FLOAT',
+        type=float,
+        default=0.01)
+
+    parser.add_argument(
+        '-d',
+        '--data',
+        help='Labeled data file',
+        metavar='FILE',
+        type=str,
+        default='../data/all_labeled_data.txt')
+
+    parser.add_argument(
+        '-D',
+        '--dry_run',
+        help='Report without publishing',
+        action='store_true')
+
+    parser.add_argument(
+        '-l',
+        '--latency_ratio',
+        help='Largest allowed p50 and p99 latency, relative to current',
+        metavar='FLOAT',
+        type=float,
+        default=1.5)
+
+    parser.add_argument(
+        '-L',
+        '--load_ratio',
+        help='Largest allowed load time, relative to current',
+        metavar='FLOAT',
+        type=float,
+        default=2.0)
+
+    parser.add_argument(
+        '-m',
+        '--model',
+        help='Current model, replaced if candidate is published',
+        metavar='PKL',
+        type=str,
+        default='../data/model.pkl')
+
+    parser.add_argument(
+        '-p',
+        '--posts',
+        help='Previously assessed posts file',
+        metavar='FILE',
+        type=str,
+        default='../data/id_file.txt')
+
+    parser.add_argument(
+        '-n',
+        '--recent',
+        help='Number of most recent assessed titles to replay',
+        metavar='INT',
+        type=int,
+        default=1000)
+
+    parser.add_argument(
+        '-r',
+        '--reps',
+        help='Number of loads used to time each model',
+        metavar='INT',
+        type=int,
+        default=20)
+
+    parser.add_argument(
+        '-S',
+        '--size_ratio',
+        help='Largest allowed file size, relative to current',
+        metavar='FLOAT',
+        type=float,
+        default=2.0)
+
+    args = parser.parse_args()
+
+    if args.reps < 1:
+        parser.error(f'--reps "{args.reps}" must be greater than 0')
+
+    return Args(accuracy_drop=args.accuracy_drop, candidate=args.candidate,
+                data=args.data, dry_run=args.dry_run,
+                latency_ratio=args.latency_ratio, load_ratio=args.load_ratio,
+                model=args.model, posts=args.posts, recent=args.recent,
+                reps=args.reps, size_ratio=args.size_ratio)
+
+
+# --------------------------------------------------
+def read_corpus(data_file, posts_file, recent):
+    """Labeled titles, then the most recent titles the bot assessed"""
+
+    data = pd.read_csv(data_file, delimiter='\t', header=0)
+    titles = list(data.title)
+    subs = list(data['sub'])
+
+    # Only the tail of the history is kept, however long it grows
+    tail: deque = deque(maxlen=recent)
+    for row in harvest.read_rows(posts_file):
+        if len(row) == 5 and row[3] and row[4] not in ['', 'NA']:
+            tail.append((row[4], row[3]))
+
+    for title, sub in tail:
+        titles.append(title)
+        subs.append(sub)
+
+    return titles, subs, data.label.to_numpy()
+
+
+# --------------------------------------------------
+def load_routes(pkl_file, reps):
+    """Router for a model file, and average time to load it"""
+
+    start = time.perf_counter()
+    for _ in range(reps):
+        with open(pkl_file, 'rb') as fh:
+            tuples = router.read_artifacts(pickle.load(fh))
+        routes = router.make_router(tuples)
+    load = (time.perf_counter() - start) / reps
+
+    # Same check as bot.py makes when loading
+    healthy = all(model_accuracy == model.score(x_test, y_test)
+                  for model, x_test, y_test, model_accuracy, _, _
+                  in tuples.values())
+
+    return routes, load, healthy
+
+
+# --------------------------------------------------
+def replay(routers, titles, subs):
+    """Predictions and per-title latencies, scoring as bot.py does"""
+
+    preds = np.zeros((len(routers), len(titles)), dtype=int)
+    latencies = np.zeros((len(routers), len(titles)))
+
+    # Models take turns on each title, so drift in machine load hits both
+    for i, (title, sub) in enumerate(zip(titles, subs)):
+        for j, routes in enumerate(routers):
+            start = time.perf_counter()
+            _, (model, vec, threshold) = routes.route(sub)
+            features, _ = bayes.get_features([bayes.clean_title(title)], vec)
+            preds[j, i] = model.predict_proba(features)[0, 1] >= threshold
+            latencies[j, i] = time.perf_counter() - start
+
+    return preds, latencies
+
+
+# --------------------------------------------------
+def summarize(pkl_file, load, preds, latencies, labels):
+    """Benchmark results for one model file"""
+
+    p50, p99 = np.percentile(latencies, [50, 99])
+
+    return {'load': load, 'p50': p50, 'p99': p99,
+            'size': os.path.getsize(pkl_file),
+            'accuracy': np.mean(preds[:len(labels)] == labels),
+            'preds': preds}
+
+
+# --------------------------------------------------
+def publish(candidate, model_file):
+    """Replace model file with candidate in one step, keeping the old one"""
+
+    tmp_file = f'{model_file}.tmp'
+    shutil.copyfile(candidate, tmp_file)
+    with open(tmp_file, 'rb+') as fh:
+        os.fsync(fh.fileno())
+
+    if os.path.isfile(model_file):
+        shutil.copy2(model_file, f'{model_file}.prev')
+
+    # Readers see either the whole old model or the whole new one
+    os.replace(tmp_file, model_file)
+
+
+# --------------------------------------------------
+def main():
+    """The good stuff"""
+
+    # Retrieve command-line arguments from argparse
+    args = get_args()
+
+    # Check for files
+    for f in [args.candidate, args.data, args.posts]:
+        if not os.path.isfile(f):
+            hp.die(f'File: "{f}" not found')
+
+    titles, subs, labels = read_corpus(args.data, args.posts, args.recent)
+
+    # Load stop words before anything is timed
+    bayes.clean_title('')
+
+    files = [args.candidate]
+    if os.path.isfile(args.model):
+        files.append(args.model)
+    else:
+        print(f'No current model at "{args.model}", nothing to compare.')
+
+    loaded = [load_routes(pkl_file, args.reps) for pkl_file in files]
+    if not loaded[0][2]:
+        hp.die('Candidate saved and test accuracy do not match.')
+
+    preds, latencies = replay([routes for routes, _, _ in loaded],
+                              titles, subs)
+    results = [summarize(pkl_file, loaded[j][1], preds[j], latencies[j],
+                         labels)
+               for j, pkl_file in enumerate(files)]
+    new = results[0]
+    old = results[1] if len(results) > 1 else None
+
+    # Metric, scale, unit, limit on candidate given current
+    budgets = [('load', 1e3, 'ms', lambda cur: cur * args.load_ratio),
+               ('p50', 1e6, 'us', lambda cur: cur * args.latency_ratio),
+               ('p99', 1e6, 'us', lambda cur: cur * args.latency_ratio),
+               ('size', 1e-3, 'kB', lambda cur: cur * args.size_ratio),
+               ('accuracy', 1e2, '%', lambda cur: cur - args.accuracy_drop)]
+
+    print(f'Replayed {len(titles)} titles ({len(labels)} labeled)')
+    print(f'{"Metric":14}{"Current":>10}{"Candidate":>10}{"Limit":>10}  OK')
+    over = []
+    for name, scale, unit, limit in budgets:
+        value = new[name] * scale
+        if old is None:
+            print(f'{name + " (" + unit + ")":14}{"":>10}{value:>10.2f}')
+            continue
+
+        bound = limit(old[name])
+        # Accuracy has a floor, everything else a ceiling
+        ok = new[name] >= bound if name == 'accuracy' else new[name] <= bound
+        if not ok:
+            over.append(name)
+
+        print(f'{name + " (" + unit + ")":14}{old[name] * scale:>10.2f}'
+              f'{value:>10.2f}{bound * scale:>10.2f}  '
+              f'{"yes" if ok else "no"}')
+
+    if old is not None:
+        changed = np.mean(new['preds'] != old['preds'])
+        print(f'Predictions changed: {changed:.1%}')
+
+    if over:
+        hp.die(f'Not published, over budget: {", ".join(over)}.')
+
+    if args.dry_run:
+        print('Within budgets, not published (dry run).')
+        return
+
+    publish(args.candidate, args.model)
+    print(f'Published "{args.candidate}" to "{args.model}".')
+
+
+# --------------------------------------------------
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Author : schackartk
+Purpose: Choose the decision threshold of a model made by bayes.py
+Date   : 19 October 2026
+"""
+
+import argparse                  # Accept commandline arguments
+import bayes                     # My model file
+import helpers as hp             # Custom made helpers
+import matplotlib.pyplot as plt  # Plot curves
+import numpy as np               # Threshold sweep
+import os                        # Working with files
+import pandas as pd              # Read csv as panda data frame
+import pickle                    # Read and write model artifact
+import search                    # Shared train/test splits
+
+from typing import NamedTuple
+
+
+class Args(NamedTuple):
+    """Command-line arguments"""
+    data: str
+    dry_run: bool
+    fn_cost: float
+    fp_cost: float
+    model: str
+    plot: str
+    runs: int
+    seed: int
+    subs: str
+    split: float
+
+
+# --------------------------------------------------
+def get_args():
+    """Get command-line arguments"""
+    parser = argparse.ArgumentParser(
+        description='Sweep decision thresholds of the bayesian model',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument(
+        '-d',
+        '--data',
+        help='Labeled data file',
+        metavar='FILE',
+        type=str,
+        default='../data/all_labeled_data.txt')
+
+    parser.add_argument(
+        '-D',
+        '--dry_run',
+        help='Report threshold without saving it to the model',
+        action='store_true')
+
+    parser.add_argument(
+        '-f',
+        '--fp_cost',
+        help='Cost of commenting on a correct title',
+        metavar='FLOAT',
+        type=float,
+        default=1.0)
+
+    parser.add_argument(
+        '-N',
+        '--fn_cost',
+        help='Cost of missing a misspelled title',
+        metavar='FLOAT',
+        type=float,
+        default=1.0)
+
+    parser.add_argument(
+        '-m',
+        '--model',
+        help='Model made by bayes.py, threshold is saved into it',
+        metavar='PKL',
+        type=str,
+        default='../data/model.pkl')
+
+    parser.add_argument(
+        '-o',
+        '--plot',
+        help='ROC and precision-recall plot output',
+        metavar='FILE',
+        type=str,
+        default='../data/roc.svg')
+
+    parser.add_argument(
+        '-R',
+        '--runs',
+        help='Number of random train/test splits',
+        metavar='INT',
+        type=int,
+        default=20)
+
+    parser.add_argument(
+        '-e',
+        '--seed',
+        help='Random seed for splits',
+        metavar='INT',
+        type=int,
+        default=0)
+
+    parser.add_argument(
+        '-s',
+        '--subreddits',
+        help='Which subreddits to train on',
+        metavar='list',
+        type=str,
+        default='ramen,food,FoodPorn')
+
+    parser.add_argument(
+        '-r',
+        '--test_split',
+        help='Test data split ratio',
+        metavar='FLOAT',
+        type=float,
+        default=0.2)
+
+    args = parser.parse_args()
+
+    if args.runs < 1:
+        parser.error(f'--runs "{args.runs}" must be greater than 0')
+
+    for name in ['fp_cost', 'fn_cost']:
+        if getattr(args, name) < 0:
+            parser.error(f'--{name} "{getattr(args, name)}" '
+                         'must not be negative')
+
+    return Args(data=args.data, dry_run=args.dry_run, fn_cost=args.fn_cost,
+                fp_cost=args.fp_cost, model=args.model, plot=args.plot,
+                runs=args.runs, seed=args.seed, subs=args.subreddits,
+                split=args.test_split)
+
+
+# --------------------------------------------------
+def split_scores(splits, alpha):
+    """Labels and positive class probabilities from every test split"""
+
+    labels, scores = [], []
+    for x_train, x_test, y_train, y_test in splits:
+        model = bayes.generate_model(x_train, y_train, alpha)
+        labels.append(y_test)
+        scores.append(model.predict_proba(x_test)[:, 1])
+
+    return np.concatenate(labels), np.concatenate(scores)
+
+
+# --------------------------------------------------
+def sweep(labels, scores, fp_cost=1.0, fn_cost=1.0):
+    """Confusion counts and curves at every distinct threshold"""
+
+    # Highest score first, so each prefix is what a threshold lets through
+    order = np.argsort(-scores, kind='stable')
+    scores = scores[order]
+    labels = labels[order]
+
+    # Equal scores share a threshold, so count at the end of each run
+    last = np.r_[np.flatnonzero(np.diff(scores)), scores.size - 1]
+    tp = np.r_[0, np.cumsum(labels)[last]]
+    fp = np.r_[0, last + 1] - tp
+    thresholds = np.r_[np.inf, scores[last]]
+
+    pos = tp[-1]
+    neg = fp[-1]
+    fn = pos - tp
+
+    tpr = tp / max(pos, 1)
+    fpr = fp / max(neg, 1)
+    precision = np.divide(tp, tp + fp, out=np.ones(tp.size),
+                          where=(tp + fp) > 0)
+    cost = fp_cost * fp + fn_cost * fn
+
+    # Lowest cost, ties go to the higher threshold and so fewer comments.
+    # The first point (threshold inf) never comments, so can't be saved.
+    best = 1 + int(np.argmin(cost[1:]))
+
+    return {'thresholds': thresholds, 'tpr': tpr, 'fpr': fpr,
+            'precision': precision, 'cost': cost / scores.size,
+            'auc': np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1]) / 2),
+            'ap': np.sum(np.diff(tpr) * precision[1:]),
+            'best': best}
+
+
+# --------------------------------------------------
+def at_threshold(curve, threshold):
+    """Index of the curve point a given threshold falls on"""
+
+    # Thresholds descend, so count those at or above it
+    below = -curve['thresholds']
+    return int(np.searchsorted(below, -threshold, side='right')) - 1
+
+
+# --------------------------------------------------
+def plot_curves(curve, points, plot_file):
+    """Save ROC and precision-recall curves, marking thresholds"""
+
+    fig, (ax_roc, ax_pr) = plt.subplots(1, 2, figsize=(12, 5))
+
+    ax_roc.plot(curve['fpr'], curve['tpr'])
+    ax_roc.plot([0, 1], [0, 1], linestyle='--', color='grey')
+    ax_roc.set_xlabel('False Positive Rate')
+    ax_roc.set_ylabel('True Positive Rate')
+    ax_roc.set_title(f'ROC (AUC: {curve["auc"]:.3f})')
+
+    ax_pr.plot(curve['tpr'][1:], curve['precision'][1:])
+    ax_pr.set_xlabel('Recall')
+    ax_pr.set_ylabel('Precision')
+    ax_pr.set_title(f'Precision-Recall (AP: {curve["ap"]:.3f})')
+
+    for label, _, i in points:
+        ax_roc.scatter(curve['fpr'][i], curve['tpr'][i], label=label)
+        ax_pr.scatter(curve['tpr'][i], curve['precision'][i], label=label)
+
+    ax_roc.legend(loc='lower right')
+    fig.savefig(plot_file)
+    plt.close(fig)
+
+
+# --------------------------------------------------
+def save_threshold(pkl_file, model_tuple, threshold):
+    """Rewrite model artifact with threshold, replacing it atomically"""
+
+    tmp_file = f'{pkl_file}.tmp'
+    with open(tmp_file, 'wb') as fh:
+        pickle.dump((*model_tuple[:5], threshold), fh)
+
+    os.replace(tmp_file, pkl_file)
+
+
+# --------------------------------------------------
+def main():
+    """The good stuff"""
+
+    # Retrieve command-line arguments from argparse
+    args = get_args()
+
+    for f, kind in [(args.data, 'Data'), (args.model, 'Model')]:
+        if not os.path.isfile(f):
+            hp.die(f'{kind} file "{f}" not found.')
+
+    with open(args.model, 'rb') as fh:
+        artifact = pickle.load(fh)
+
+    if isinstance(artifact, dict):
+        hp.die(f'"{args.model}" is a bundle, bundle.py sets its thresholds.')
+
+    model_tuple = bayes.unpack_model(artifact)
+    model, _, _, _, vec, old_threshold = model_tuple
+
+    # Sweep models made the same way as the saved one
+    raw_data = pd.read_csv(args.data, delimiter='\t', header=0)
+    config = search.VecConfig(vec.ngram_range[1], False,
+                              tuple(args.subs.split(sep=',')))
+    built = search.build_matrices(raw_data, config, args.runs, args.split,
+                                  args.seed)
+
+    labels, scores = split_scores(built['splits'], model.alpha)
+    curve = sweep(labels, scores, args.fp_cost, args.fn_cost)
+
+    best = curve['best']
+    threshold = float(curve['thresholds'][best])
+    points = [('Current', old_threshold, at_threshold(curve, old_threshold)),
+              ('Chosen', threshold, best)]
+
+    print(f'Swept {scores.size} test predictions from {args.runs} splits')
+    print(f'ROC AUC: {curve["auc"]:.3f}  Average precision: '
+          f'{curve["ap"]:.3f}')
+    print(f'{"":8}{"Threshold":>10}{"TPR":>8}{"FPR":>8}{"Precision":>10}'
+          f'{"Cost":>8}')
+    for label, point, i in points:
+        print(f'{label:8}{point:>10.3f}'
+              f'{curve["tpr"][i]:>8.1%}{curve["fpr"][i]:>8.1%}'
+              f'{curve["precision"][i]:>10.1%}{curve["cost"][i]:>8.3f}')
+
+    plot_curves(curve, points, args.plot)
+    print(f'Curves saved to "{args.plot}".')
+
+    if not args.dry_run:
+        save_threshold(args.model, model_tuple, threshold)
+        print(f'Threshold {threshold:.3f} saved to "{args.model}".')
+
+
+# --------------------------------------------------
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Author : schackartk
+Purpose: Route titles to the model trained for their subreddit
+Date   : 19 October 2026
+"""
+
+import bayes           # Model artifact format
+
+from typing import NamedTuple
+
+
+class Route(NamedTuple):
+    """What is needed to score a title"""
+    model: object
+    vec: object
+    threshold: float
+
+
+class Router:
+    """Models keyed by subreddit, with a fallback for any other"""
+
+    def __init__(self, routes, fallback):
+        self.routes = routes
+        self.fallback = fallback
+
+    def route(self, sub=None):
+        """Name and route of model for a subreddit, '' for the fallback"""
+
+        name = (sub or '').lower()
+        if name in self.routes:
+            return name, self.routes[name]
+
+        return '', self.fallback
+
+    def names(self):
+        """Subreddits with their own model"""
+
+        return sorted(self.routes)
+
+
+# --------------------------------------------------
+def read_artifacts(artifact):
+    """Model tuples of a bundle or a single model, keyed by subreddit"""
+
+    # A single model from bayes.py is a bundle with only the fallback
+    if not isinstance(artifact, dict):
+        return {'': bayes.unpack_model(artifact)}
+
+    tuples = {sub.lower(): bayes.unpack_model(model_tuple)
+              for sub, model_tuple in artifact['subs'].items()}
+    tuples[''] = bayes.unpack_model(artifact['fallback'])
+
+    return tuples
+
+
+# --------------------------------------------------
+def make_router(tuples):
+    """Router from model tuples, leaving out their test data"""
+
+    routes = {sub: Route(model, vec, threshold)
+              for sub, (model, _, _, _, vec, threshold) in tuples.items()}
+    fallback = routes.pop('')
+
+    return Router(routes, fallback)
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Author : schackartk
+Purpose: Search hyperparameters of the Bayes model over many splits
+Date   : 19 October 2026
+"""
+
+import argparse                  # Accept commandline arguments
+import bayes                     # My model file
+import helpers as hp             # Custom made helpers
+import itertools                 # Build the search grid
+import numpy as np               # Summarize accuracies
+import os                        # Working with files
+import pandas as pd              # Read csv as panda data frame
+import random                    # Random search
+import time                      # Time inference
+
+from multiprocessing import Pool
+from sklearn.model_selection import train_test_split
+from typing import NamedTuple
+
+# Document-term matrices, built once and shared read-only by workers
+MATRICES: dict = {}
+
+
+class Args(NamedTuple):
+    """Command-line arguments"""
+    alphas: str
+    candidates: int
+    data: str
+    ngrams: str
+    procs: int
+    runs: int
+    seed: int
+    subs: str
+    subsets: bool
+    split: float
+
+
+class VecConfig(NamedTuple):
+    """Settings that change the document-term matrices"""
+    ngrams: int
+    keyword: bool
+    subs: tuple
+
+
+# --------------------------------------------------
+def get_args():
+    """Get command-line arguments"""
+    parser = argparse.ArgumentParser(
+        description='Search hyperparameters of the bayesian model',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument(
+        '-a',
+        '--alphas',
+        help='Smoothing parameters to try',
+        metavar='list',
+        type=str,
+        default='0.1,0.25,0.5,1,2')
+
+    parser.add_argument(
+        '-d',
+        '--data',
+        help='Labeled data file',
+        metavar='FILE',
+        type=str,
+        default='../data/all_labeled_data.txt')
+
+    parser.add_argument(
+        '-n',
+        '--ngrams',
+        help='Longest word n-grams to try',
+        metavar='list',
+        type=str,
+        default='1,2')
+
+    parser.add_argument(
+        '-p',
+        '--procs',
+        help='Number of worker processes',
+        metavar='INT',
+        type=int,
+        default=os.cpu_count())
+
+    parser.add_argument(
+        '-R',
+        '--runs',
+        help='Number of random train/test splits per candidate',
+        metavar='INT',
+        type=int,
+        default=20)
+
+    parser.add_argument(
+        '-c',
+        '--candidates',
+        help='Randomly sample this many candidates (0: full grid)',
+        metavar='INT',
+        type=int,
+        default=0)
+
+    parser.add_argument(
+        '-e',
+        '--seed',
+        help='Random seed for splits and sampling',
+        metavar='INT',
+        type=int,
+        default=0)
+
+    parser.add_argument(
+        '-s',
+        '--subreddits',
+        help='Which subreddits to train on',
+        metavar='list',
+        type=str,
+        default='ramen,food,FoodPorn')
+
+    parser.add_argument(
+        '-S',
+        '--subsets',
+        help='Also try every subset of --subreddits',
+        action='store_true')
+
+    parser.add_argument(
+        '-r',
+        '--test_split',
+        help='Test data split ratio',
+        metavar='FLOAT',
+        type=float,
+        default=0.2)
+
+    args = parser.parse_args()
+
+    for name in ['procs', 'runs']:
+        if getattr(args, name) < 1:
+            parser.error(f'--{name} "{getattr(args, name)}" '
+                         'must be greater than 0')
+
+    return Args(alphas=args.alphas, data=args.data, ngrams=args.ngrams,
+                procs=args.procs, runs=args.runs, candidates=args.candidates,
+                seed=args.seed, subs=args.subreddits, subsets=args.subsets,
+                split=args.test_split)
+
+
+# --------------------------------------------------
+def get_vec_configs(ngrams, subs, subsets):
+    """All vectorizer settings to build matrices for"""
+
+    if subsets:
+        sub_lists = [combo for n in range(1, len(subs) + 1)
+                     for combo in itertools.combinations(subs, n)]
+    else:
+        sub_lists = [tuple(subs)]
+
+    return [VecConfig(n, keyword, sub_list)
+            for n in ngrams
+            for keyword in [False, True]
+            for sub_list in sub_lists]
+
+
+# --------------------------------------------------
+def build_matrices(raw_data, config, runs, split, seed):
+    """Build train and test matrices for every split of one config"""
+
+    data = bayes.filt_subs(raw_data, list(config.subs))
+    extra = () if config.keyword else ('tonkatsu',)
+    titles = [bayes.clean_title(title, extra) for title in data.title]
+    labels = data.label.to_numpy()
+
+    splits = []
+    for run in range(runs):
+        t_train, t_test, y_train, y_test = train_test_split(
+            titles, labels, test_size=split, random_state=seed + run)
+        x_train, vec = bayes.get_features(t_train, None, config.ngrams)
+        x_test, _ = bayes.get_features(t_test, vec)
+        splits.append((x_train, x_test, y_train, y_test))
+
+    # Last split's vectorizer and titles are kept to time inference
+    return {'splits': splits, 'vec': vec, 'titles': t_test,
+            'n': len(titles)}
+
+
+# --------------------------------------------------
+def init_worker(matrices):
+    """Share matrices with a worker once instead of once per candidate"""
+
+    MATRICES.update(matrices)
+
+
+# --------------------------------------------------
+def evaluate(candidate):
+    """Accuracy over all splits and per-title latency for a candidate"""
+
+    config, alpha = candidate
+    built = MATRICES[config]
+
+    accuracies = []
+    for x_train, x_test, y_train, y_test in built['splits']:
+        model = bayes.generate_model(x_train, y_train, alpha)
+        accuracies.append(model.score(x_test, y_test))
+
+    # Time a title at a time, as bot.py sees them
+    start = time.perf_counter()
+    for title in built['titles']:
+        features, _ = bayes.get_features([title], built['vec'])
+        model.predict(features)
+    latency = (time.perf_counter() - start) / len(built['titles'])
+
+    return config, alpha, np.mean(accuracies), np.std(accuracies), latency
+
+
+# --------------------------------------------------
+def main():
+    """The good stuff"""
+
+    # Retrieve command-line arguments from argparse
+    args = get_args()
+    data_file = args.data
+
+    # Check for data file
+    if not os.path.isfile(data_file):
+        hp.die(f'Data file "{data_file}" not found.')
+
+    alphas = [float(alpha) for alpha in args.alphas.split(sep=',')]
+    ngrams = [int(n) for n in args.ngrams.split(sep=',')]
+    subs = args.subs.split(sep=',')
+
+    raw_data = pd.read_csv(data_file, delimiter='\t', header=0)
+
+    configs = get_vec_configs(ngrams, subs, args.subsets)
+    candidates = list(itertools.product(configs, alphas))
+
+    if 0 < args.candidates < len(candidates):
+        rng = random.Random(args.seed)
+        candidates = rng.sample(candidates, args.candidates)
+        configs = list(dict.fromkeys(config for config, _ in candidates))
+
+    print(f'Building matrices for {len(configs)} vectorizer settings')
+    matrices = {config: build_matrices(raw_data, config, args.runs,
+                                       args.split, args.seed)
+                for config in configs}
+
+    print(f'Evaluating {len(candidates)} candidates '
+          f'over {args.runs} splits each')
+    with Pool(args.procs, initializer=init_worker,
+              initargs=(matrices,)) as pool:
+        results = pool.map(evaluate, candidates)
+
+    # Best accuracy first, faster inference breaks ties
+    results.sort(key=lambda res: (-res[2], res[4]))
+
+    print(f'{"Rank":>4} {"Alpha":>6} {"Ngrams":>6} {"Keyword":>7} '
+          f'{"Titles":>6} {"Mean":>6} {"Std":>6} {"Latency":>10}  Subreddits')
+    for rank, (config, alpha, mean, std, latency) in enumerate(results, 1):
+        n_titles = matrices[config]['n']
+        print(f'{rank:>4} {alpha:>6g} {config.ngrams:>6} '
+              f'{"kept" if config.keyword else "drop":>7} {n_titles:>6} '
+              f'{mean:>6.1%} {std:>6.1%} {latency * 1e6:>8.0f}us  '
+              f'{",".join(config.subs)}')
+
+
+# --------------------------------------------------
+if __name__ == '__main__':
+    main()
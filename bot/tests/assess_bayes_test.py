@@ -0,0 +1,84 @@
+"""
+Author : schackartk
+Purpose: Model assessment over many runs tests
+Date   : 19 October 2026
+"""
+
+import helpers as hp  # Custom helpers
+import numpy as np    # Read experiment
+import os             # Check for files
+import re             # Regular expressions
+import shutil
+
+from subprocess import getstatusoutput
+
+PRG = './assess_bayes.py'
+
+
+# --------------------------------------------------
+def test_exists():
+    """ assess_bayes.py exists """
+
+    assert os.path.isfile(PRG)
+
+
+# --------------------------------------------------
+def test_usage():
+    """ assess_bayes.py usage """
+
+    for flag in ['-h', '--help']:
+        rv, out = getstatusoutput(f'{PRG} {flag}')
+        assert rv == 0
+        assert re.match("usage", out, re.IGNORECASE)
+
+
+# --------------------------------------------------
+def test_bad_input():
+    """ Bad input for run files and experiment """
+
+    bad_file = hp.random_string()
+
+    rv, out = getstatusoutput(f'{PRG} {bad_file}')
+    assert rv > 0
+    assert out == f'Test data file "{bad_file}" not found.'
+
+    rv, out = getstatusoutput(f'{PRG} -e {bad_file}')
+    assert rv > 0
+    assert out == f'Experiment "{bad_file}" not found.'
+
+
+# --------------------------------------------------
+def test_runs_okay():
+    """ Packs runs of bayes.py and aggregates them """
+
+    out_dir = 'out_test'
+    try:
+        if os.path.isdir(out_dir):
+            shutil.rmtree(out_dir)
+
+        os.makedirs(out_dir)
+
+        for run in range(2):
+            rv, _ = getstatusoutput(f'./bayes.py -o {out_dir}/model.pkl '
+                                    f'-t {out_dir}/test_data{run}.npz '
+                                    f'-e {run}')
+            assert rv == 0
+
+        rv, out = getstatusoutput(f'{PRG} -e {out_dir}/exp '
+                                  f'{out_dir}/test_data0.npz '
+                                  f'{out_dir}/test_data1.npz')
+        assert rv == 0
+        assert out.startswith(f'Packed 2 runs into "{out_dir}/exp".')
+        assert re.search(r'Aggregated 2 runs \(\d+ predictions\)', out)
+
+        seeds = np.load(f'{out_dir}/exp/seed.npy', mmap_mode='r')
+        assert list(seeds) == [0, 1]
+
+        # Already packed experiment is read as is
+        rv, out = getstatusoutput(f'{PRG} -e {out_dir}/exp')
+        assert rv == 0
+        assert out.startswith('Aggregated 2 runs')
+
+    finally:
+        if os.path.isdir(out_dir):
+            shutil.rmtree(out_dir)
@@ -5,6 +5,7 @@ Date   : 1 July 2021
 """
 
 import helpers as hp  # Custom helpers
+import numpy as np    # Read test data
 import os             # Check for files
 import re             # Regular expressions
 import shutil
@@ -54,12 +55,49 @@ def test_runs_okay():
         os.makedirs(out_dir)
 
         rv, _ = getstatusoutput(f'{PRG} -o {out_dir}/model.pkl '
-                                f'-t {out_dir}/test_data.txt')
+                                f'-t {out_dir}/test_data.npz -e 7')
 
         assert rv == 0
 
         assert os.path.isfile(f'{out_dir}/model.pkl')
-        assert os.path.isfile(f'{out_dir}/test_data.txt')
+        assert os.path.isfile(f'{out_dir}/test_data.npz')
+
+        with np.load(f'{out_dir}/test_data.npz') as test_data:
+            assert int(test_data['seed']) == 7
+            n_test = test_data['id'].size
+            for col in ['label', 'pred', 'prob']:
+                assert test_data[col].size == n_test
+
+    finally:
+        if os.path.isdir(out_dir):
+            shutil.rmtree(out_dir)
+
+
+# --------------------------------------------------
+def test_profile():
+    """ Profiling writes stats, summary and stacks """
+
+    out_dir = 'out_test'
+    try:
+        if os.path.isdir(out_dir):
+            shutil.rmtree(out_dir)
+
+        os.makedirs(out_dir)
+
+        rv, _ = getstatusoutput(f'{PRG} -o {out_dir}/model.pkl '
+                                f'-t {out_dir}/test_data.npz '
+                                f'-P {out_dir}/prof -F')
+
+        assert rv == 0
+
+        for ext in ['pstats', 'txt', 'collapsed']:
+            assert os.path.isfile(f'{out_dir}/prof.{ext}')
+
+        with open(f'{out_dir}/prof.txt') as fh:
+            summary = fh.read()
+
+        assert re.search(r'^clean titles\s', summary, re.M)
+        assert re.search(r'clean_title', summary)
 
     finally:
         if os.path.isdir(out_dir):
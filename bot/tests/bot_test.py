@@ -4,13 +4,22 @@ Purpose: Reddit bot tests
 Date   : 22 April 2020
 """
 
+import bayes          # Read model threshold
 import bot            # My bot program, to be tested
 import helpers as hp  # Custom helpers
 import config         # Login config file
+import numpy as np    # Read test data
 import os             # Check for files
+import pickle         # Read model file
+import pandas as pd   # Read labeled data
+import praw           # Reddit instances for the phases
+import profiler       # Phases are run through a profiler
 import re             # Regular expressions
+import time           # Hold requests open
 
+from journal import Journal
 from subprocess import getstatusoutput
+from types import SimpleNamespace
 
 PRG = "./bot.py"
 
@@ -58,6 +67,416 @@ def test_get_history():
     assert str(type(id_dict)) == "<class 'dict'>"
 
 
+# --------------------------------------------------
+def test_claim_id():
+    """ Posts can only be claimed once in the shared history """
+
+    id_dict = {'abc123': '1'}
+
+    assert not bot.claim_id(id_dict, 'abc123')
+    assert bot.claim_id(id_dict, 'xyz789', 's')
+    assert id_dict['xyz789'] == 's'
+    assert not bot.claim_id(id_dict, 'xyz789')
+
+
+# --------------------------------------------------
+class StubListing(list):
+    """Replies or comments, all loaded already"""
+
+    def replace_more(self, limit=None):
+        """Nothing more to load"""
+
+        return []
+
+
+# --------------------------------------------------
+class StubAuthor(str):
+    """User name that also has .name, like a praw Redditor"""
+
+    @property
+    def name(self):
+        """User name"""
+
+        return str(self)
+
+
+# --------------------------------------------------
+class StubThing:
+    """Post or comment that records what the bot does to it"""
+
+    def __init__(self, reddit, fullname, author, **attrs):
+        self.reddit = reddit
+        self.fullname = fullname
+        self.id = fullname[3:]
+        self.author = StubAuthor(author) if author else None
+        self.comments = self.replies = StubListing()
+        self.body = ''
+        self.subreddit = SimpleNamespace(display_name='ramen')
+        self.__dict__.update(attrs)
+        reddit.things[self.id] = self
+
+    def reply(self, text):
+        """Reply as the bot"""
+
+        reply = StubThing(self.reddit, f't1_{self.id}r{len(self.replies)}',
+                          config.username, body=text, link_id=self.fullname)
+        self.replies.append(reply)
+        self.reddit.replies.append(self.id)
+        return reply
+
+    def edit(self, text):
+        """Edit body"""
+
+        self.body = text
+
+    def refresh(self):
+        """Replies are always up to date"""
+
+    def delete(self):
+        """Deleted comments lose their author"""
+
+        self.author = None
+        self.reddit.deleted.append(self.id)
+
+
+# --------------------------------------------------
+class StubReddit:
+    """Just enough of praw.Reddit to replay journaled actions"""
+
+    def __init__(self):
+        self.things = {}
+        self.replies = []
+        self.deleted = []
+        self.sent = []
+        self.posts = []
+        self.mentions = []
+        self.inbox = SimpleNamespace(sent=lambda limit: list(self.sent),
+                                     mentions=lambda: list(self.mentions),
+                                     messages=lambda: [])
+
+    def subreddit(self, name):
+        """Subreddits with the new posts"""
+
+        return SimpleNamespace(new=lambda: list(self.posts))
+
+    def submission(self, id):  # pylint: disable=redefined-builtin
+        """Look up post"""
+
+        return self.things[id]
+
+    def comment(self, id):  # pylint: disable=redefined-builtin
+        """Look up comment"""
+
+        return self.things[id]
+
+    def redditor(self, name):
+        """User the bot can message"""
+
+        def message(subject, body):
+            self.sent.append(SimpleNamespace(dest=name, subject=subject,
+                                             body=body))
+
+        return SimpleNamespace(message=message,
+                               comments=SimpleNamespace(new=lambda limit: []))
+
+
+# --------------------------------------------------
+def replay(r, journal_file):
+    """Recover journal, returning files written"""
+
+    files = [hp.random_string() for _ in range(2)]
+    for f in files:
+        open(f, 'w').close()
+
+    try:
+        bot.recover(r, '../data/comment.txt', files[0], files[1],
+                    Journal(journal_file))
+        assert not Journal(journal_file).pending()
+
+        contents = []
+        for f in files:
+            with open(f) as fh:
+                contents.append(fh.read().splitlines())
+        return contents
+
+    finally:
+        for f in files:
+            os.remove(f)
+
+
+# --------------------------------------------------
+def test_reply_once():
+    """ Reply is only made again if the first did not go through """
+
+    r = StubReddit()
+    post = StubThing(r, 't3_p1', 'someone')
+    journal_file = hp.random_string()
+    try:
+        journal = Journal(journal_file)
+
+        entry = journal.begin('post', post='p1')
+        first = bot.reply_once(post, 'hi', journal, entry, 'comment')
+        assert 'comment-' in entry['steps']
+
+        # Crash after replying, then again before
+        assert bot.reply_once(post, 'hi', journal, entry, 'comment') is first
+        assert bot.find_reply(post) is first
+        post.replies.clear()
+        bot.reply_once(post, 'hi', journal, entry, 'comment')
+        assert r.replies == ['p1', 'p1']
+
+        mention = StubThing(r, 't1_m1', 'someone')
+        assert bot.find_reply(mention) is None
+
+    finally:
+        os.remove(journal_file)
+
+
+# --------------------------------------------------
+def test_recover_post():
+    """ Crashed post is commented on and notified about only once """
+
+    r = StubReddit()
+    post = StubThing(r, 't3_p1', 'someone')
+    old_reply = post.reply('draft')
+    r.sent.append(SimpleNamespace(dest=config.username,
+                                  subject='Tonkatsu Found', body='Found'))
+    r.replies.clear()
+
+    journal_file = hp.random_string()
+    try:
+        journal = Journal(journal_file)
+        entry = journal.begin('post', post='p1', pred=1, act=1, sub='ramen',
+                              title='Tonkatsu ramen', note='Found')
+        journal.step(entry, 'comment-')
+        journal.step(entry, 'told-bot-')
+
+        ids, _ = replay(r, journal_file)
+
+        assert r.replies == []
+        assert old_reply.fullname in old_reply.body
+        sent_to = [m.dest for m in r.sent]
+        assert sent_to == [config.username, config.human_acct]
+        assert ids == ['p1\t1\t1\tramen\tTonkatsu ramen']
+
+        # Nothing left to replay
+        assert replay(r, journal_file) == [[], []]
+        assert r.replies == [] and len(r.sent) == 2
+
+    finally:
+        os.remove(journal_file)
+
+
+# --------------------------------------------------
+def test_recover_post_before_reply():
+    """ Crash before the reply went through replies once """
+
+    r = StubReddit()
+    StubThing(r, 't3_p1', 'someone')
+
+    journal_file = hp.random_string()
+    try:
+        journal = Journal(journal_file)
+        entry = journal.begin('post', post='p1', pred=1, act=1, sub='ramen',
+                              title='Tonkatsu ramen', note='Found')
+        journal.step(entry, 'comment-')
+
+        replay(r, journal_file)
+
+        assert r.replies == ['p1']
+        assert len(r.sent) == 2
+
+    finally:
+        os.remove(journal_file)
+
+
+# --------------------------------------------------
+def test_recover_summon():
+    """ Finished steps of a summon are skipped """
+
+    r = StubReddit()
+    post = StubThing(r, 't3_p2', 'someone')
+    mention = StubThing(r, 't1_m1', 'summoner', parent_id='t3_p2')
+    post.reply('done')
+    mention.reply('thanks')
+    r.replies.clear()
+
+    journal_file = hp.random_string()
+    try:
+        journal = Journal(journal_file)
+        entry = journal.begin('summon', mention='m1', summoner='summoner',
+                              sub='ramen', parent='t3_p2', note='Summoned')
+        journal.step(entry, 'saved')
+        journal.step(entry, 'commented', comment='p2r0')
+        journal.step(entry, 'thank-')
+
+        ids, _ = replay(r, journal_file)
+
+        assert ids == []
+        assert r.replies == []
+        assert [m.subject for m in r.sent] == ['Bot Summoned'] * 2
+
+    finally:
+        os.remove(journal_file)
+
+
+# --------------------------------------------------
+def test_recover_delete():
+    """ Deletion is not repeated, and replay does not rely on author """
+
+    for author in [None, config.username]:
+        r = StubReddit()
+        comment = StubThing(r, 't1_c1', author, link_id='t3_p1')
+
+        journal_file = hp.random_string()
+        try:
+            journal = Journal(journal_file)
+            entry = journal.begin('delete', comment='c1',
+                                  author=config.username, own=True,
+                                  post='p1')
+            journal.step(entry, 'delete-')
+
+            _, deleted = replay(r, journal_file)
+
+            # Only a comment still showing its author was not yet deleted
+            assert r.deleted == ([] if author is None else ['c1'])
+            assert comment.author is None
+            assert deleted == ['c1\tp1']
+            assert [m.subject for m in r.sent] == ['Comment Removed']
+
+        finally:
+            os.remove(journal_file)
+
+
+# --------------------------------------------------
+def test_recover_failure():
+    """ A failing entry is retried, then abandoned, without stopping others """
+
+    def locked(text):
+        raise RuntimeError('Post is locked')
+
+    r = StubReddit()
+    StubThing(r, 't3_p1', 'someone').reply = locked
+    StubThing(r, 't1_c1', config.username, link_id='t3_p2')
+
+    files = [hp.random_string() for _ in range(3)]
+    try:
+        for f in files[1:]:
+            open(f, 'w').close()
+
+        journal = Journal(files[0])
+        journal.begin('post', post='p1', pred=1, act=1, sub='ramen',
+                      title='Tonkatsu ramen', note='Found')
+        journal.begin('delete', comment='c1', author=config.username,
+                      own=True, post='p2')
+
+        for attempt in range(1, bot.MAX_REPLAYS + 1):
+            bot.recover(r, '../data/comment.txt', files[1], files[2],
+                        Journal(files[0]))
+
+            # The deletion is finished on the first run regardless
+            assert r.deleted == ['c1']
+            pending = Journal(files[0]).pending()
+            if attempt < bot.MAX_REPLAYS:
+                assert len(pending) == 1
+                assert pending[0]['steps']['failed']['attempts'] == attempt
+
+        assert not pending
+        assert Journal(files[0]).checkpoint()
+
+    finally:
+        for f in files:
+            os.remove(f)
+
+
+# --------------------------------------------------
+def test_delete_others():
+    """ Comments by others are only recorded """
+
+    r = StubReddit()
+    comment = StubThing(r, 't1_c2', 'someone', link_id='t3_p1')
+
+    files = [hp.random_string() for _ in range(2)]
+    try:
+        open(files[1], 'w').close()
+        bot.delete_comment(r, comment, files[1], Journal(files[0]))
+
+        assert r.deleted == [] and r.sent == []
+        with open(files[1]) as fh:
+            assert fh.read() == 'c2\n'
+
+    finally:
+        for f in files:
+            os.remove(f)
+
+
+# --------------------------------------------------
+def test_phases_overlap(monkeypatch):
+    """ Phases each get their own reddit and wait on it side by side """
+
+    def request(self, *args, **kwargs):
+        time.sleep(0.2)
+
+    monkeypatch.setattr(praw.Reddit, 'request', request)
+
+    # Scanning makes the most requests, the whole run should take as long
+    used = []
+    for name, n_requests in [('investigate', 3), ('check_summons', 2),
+                             ('purge', 1)]:
+        def phase(r, *args, n_requests=n_requests):
+            used.append(r)
+            for _ in range(n_requests):
+                r.request(method='GET', path='/')
+
+        monkeypatch.setattr(bot, name, phase)
+
+    def connect():
+        return praw.Reddit(client_id='id', client_secret='secret',
+                           user_agent='test', check_for_updates=False)
+
+    start = time.perf_counter()
+    bot.run_phases(connect, '', '', '', '', [], {}, None, None,
+                   profiler.get_profiler(None))
+    elapsed = time.perf_counter() - start
+
+    assert len({id(r) for r in used}) == 3
+    assert 0.6 <= elapsed < 0.9
+
+
+# --------------------------------------------------
+def test_phases_claim_once(monkeypatch):
+    """ Post found by both the scan and a summon is commented on once """
+
+    monkeypatch.setattr(bot, 'predict', lambda *args, **kwargs: 1)
+
+    files = [hp.random_string() for _ in range(3)]
+    try:
+        # Either phase may get there first, but never both
+        for _ in range(20):
+            for f in files:
+                open(f, 'w').close()
+
+            r = StubReddit()
+            r.posts.append(StubThing(r, 't3_p1', 'someone',
+                                     title='Tonkatsu ramen',
+                                     permalink='/r/ramen/p1'))
+            r.mentions.append(StubThing(r, 't1_m1', 'summoner',
+                                        parent_id='t3_p1', body='Help',
+                                        context='/r/ramen/p1/m1?context=3'))
+
+            # Stubs share one reddit, so both phases see the same post
+            bot.run_phases(lambda r=r: r, '../data/comment.txt', files[0],
+                           files[1], '../data/model.pkl', ['ramen'], {}, None,
+                           Journal(files[2]), profiler.get_profiler(None))
+
+            assert r.replies.count('p1') == 1
+            assert not Journal(files[2]).pending()
+
+    finally:
+        for f in files:
+            os.remove(f)
+
+
 # --------------------------------------------------
 def test_config():
     """ Check attributes in config.py """
@@ -100,14 +519,18 @@ def test_post_ret():
 def test_predict():
     """ See if prediction model is behaving the same """
 
-    with open('../data/test_data.txt', 'r') as f:
-        next(f)  # Skip header row
-        for line in f:
-            fields = line.split('\t')
-            old_pred = int(fields[1])
-            title = fields[2]
-            new_pred = int(bot.predict(title, '../data/model.pkl'))
-            assert new_pred == old_pred
+    data = pd.read_csv('../data/all_labeled_data.txt', delimiter='\t',
+                       header=0)
+    titles = dict(zip(data.id, data.title))
+
+    # The pred column is at bayes.py's default, roc.py may have changed it
+    with open('../data/model.pkl', 'rb') as fh:
+        threshold = bayes.unpack_model(pickle.load(fh))[5]
+
+    with np.load('../data/test_data.npz') as test_data:
+        for post_id, prob in zip(test_data['id'], test_data['prob']):
+            new_pred = int(bot.predict(titles[post_id], '../data/model.pkl'))
+            assert new_pred == int(prob >= threshold)
 
 
 # --------------------------------------------------
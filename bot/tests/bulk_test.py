@@ -0,0 +1,78 @@
+"""
+Author : schackartk
+Purpose: Bulk dump classification tests
+Date   : 19 October 2026
+"""
+
+import json           # Write dump lines
+import os             # Check for files
+import re             # Regular expressions
+import shutil
+
+from subprocess import getstatusoutput
+
+PRG = './bulk.py'
+
+
+# --------------------------------------------------
+def test_exists():
+    """ bulk.py exists """
+
+    assert os.path.isfile(PRG)
+
+
+# --------------------------------------------------
+def test_usage():
+    """ bulk.py usage """
+
+    for flag in ['-h', '--help']:
+        rv, out = getstatusoutput(f'{PRG} {flag}')
+        assert rv == 0
+        assert re.match("usage", out, re.IGNORECASE)
+
+    rv, out = getstatusoutput(PRG)
+    assert rv > 0
+    assert re.match("usage", out, re.IGNORECASE)
+
+
+# --------------------------------------------------
+def test_runs_okay():
+    """ Filters and classifies a small dump """
+
+    out_dir = 'out_test'
+    try:
+        if os.path.isdir(out_dir):
+            shutil.rmtree(out_dir)
+
+        os.makedirs(out_dir)
+
+        rv, _ = getstatusoutput(f'./bayes.py -o {out_dir}/model.pkl '
+                                f'-t {out_dir}/test_data.npz')
+        assert rv == 0
+
+        posts = [('a1', 'ramen', 'Tonkatsu ramen\twith egg'),
+                 ('a2', 'pics', 'Tonkatsu ramen'),
+                 ('a3', 'food', 'Pork cutlet'),
+                 ('a4', 'FoodPorn', 'Homemade tonkatsu')]
+        with open(f'{out_dir}/dump.ndjson', 'w') as fh:
+            for post_id, sub, title in posts:
+                print(json.dumps({'id': post_id, 'subreddit': sub,
+                                  'title': title}), file=fh)
+            print('not json tonkatsu', file=fh)
+
+        rv, _ = getstatusoutput(f'{PRG} -m {out_dir}/model.pkl -p 2 '
+                                f'-o {out_dir}/out.txt {out_dir}/dump.ndjson')
+        assert rv == 0
+
+        with open(f'{out_dir}/out.txt') as fh:
+            lines = fh.read().splitlines()
+
+        assert lines[0] == 'id\tlabel\tsub\ttitle'
+        rows = [line.split('\t') for line in lines[1:]]
+        assert [row[0] for row in rows] == ['a1', 'a4']
+        assert rows[0][3] == "'Tonkatsu ramen with egg'"
+        assert all(row[1] in ['0', '1'] for row in rows)
+
+    finally:
+        if os.path.isdir(out_dir):
+            shutil.rmtree(out_dir)
@@ -0,0 +1,86 @@
+"""
+Author : schackartk
+Purpose: Per-subreddit model bundle tests
+Date   : 19 October 2026
+"""
+
+import helpers as hp  # Custom helpers
+import os             # Check for files
+import pickle         # Read bundle
+import re             # Regular expressions
+import router         # Per-subreddit models
+import shutil
+
+from subprocess import getstatusoutput
+
+PRG = './bundle.py'
+
+
+# --------------------------------------------------
+def test_exists():
+    """ bundle.py exists """
+
+    assert os.path.isfile(PRG)
+
+
+# --------------------------------------------------
+def test_usage():
+    """ bundle.py usage """
+
+    for flag in ['-h', '--help']:
+        rv, out = getstatusoutput(f'{PRG} {flag}')
+        assert rv == 0
+        assert re.match("usage", out, re.IGNORECASE)
+
+
+# --------------------------------------------------
+def test_bad_input():
+    """ Bad input for required file"""
+
+    bad_file = hp.random_string()
+
+    rv, out = getstatusoutput(f'{PRG} -d {bad_file}')
+    assert rv > 0
+    assert out == f'Data file "{bad_file}" not found.'
+
+
+# --------------------------------------------------
+def test_runs_okay():
+    """ Bundle routes subreddits to their own model or the fallback """
+
+    out_dir = 'out_test'
+    try:
+        if os.path.isdir(out_dir):
+            shutil.rmtree(out_dir)
+
+        os.makedirs(out_dir)
+
+        rv, out = getstatusoutput(f'{PRG} -o {out_dir}/bundle.pkl -e 3 '
+                                  f'-M 10')
+        assert rv == 0
+        assert re.search(r'^ramen\s+\d+\s+\d+', out, re.M)
+        assert os.path.isfile(f'{out_dir}/bundle.pkl')
+
+        with open(f'{out_dir}/bundle.pkl', 'rb') as fh:
+            routes = router.make_router(router.read_artifacts(pickle.load(fh)))
+
+        for sub in routes.names():
+            assert routes.route(sub.upper())[0] == sub
+
+        name, route = routes.route('pics')
+        assert name == ''
+        assert route == routes.fallback
+
+        # Each route has its own threshold, at which a title can be flagged
+        for sub in routes.names() + ['pics']:
+            assert 0 < routes.route(sub)[1].threshold <= 1
+
+        # Thresholds and features were already chosen for each route
+        for prg in ['./roc.py', './compact.py']:
+            rv, out = getstatusoutput(f'{prg} -m {out_dir}/bundle.pkl')
+            assert rv > 0
+            assert out.startswith(f'"{out_dir}/bundle.pkl" is a bundle')
+
+    finally:
+        if os.path.isdir(out_dir):
+            shutil.rmtree(out_dir)
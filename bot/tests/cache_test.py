@@ -0,0 +1,49 @@
+"""
+Author : schackartk
+Purpose: Prediction cache tests
+Date   : 19 October 2026
+"""
+
+import helpers as hp  # Custom helpers
+import os             # Check for files
+
+from cache import PredictionCache
+
+
+# --------------------------------------------------
+def test_lru_eviction():
+    """ Least recently used entry is evicted when full """
+
+    cache = PredictionCache(hp.random_string(), 'v1', max_size=2)
+    cache.put('ramen broth', 1)
+    cache.put('pork cutlet', 0)
+
+    assert cache.get('ramen broth') == 1  # Now most recently used
+
+    cache.put('curry rice', 0)
+
+    assert len(cache) == 2
+    assert cache.get('pork cutlet') is None
+    assert cache.get('ramen broth') == 1
+    assert cache.hits == 2
+    assert cache.misses == 1
+    assert cache.hit_rate() == 2 / 3
+
+
+# --------------------------------------------------
+def test_persist_and_invalidate():
+    """ Cache survives a save, but not a new model version """
+
+    cache_file = hp.random_string()
+    try:
+        cache = PredictionCache(cache_file, 'v1')
+        cache.put('ramen broth', 1)
+        cache.save()
+
+        assert os.path.isfile(cache_file)
+        assert PredictionCache(cache_file, 'v1').get('ramen broth') == 1
+        assert PredictionCache(cache_file, 'v2').get('ramen broth') is None
+
+    finally:
+        if os.path.isfile(cache_file):
+            os.remove(cache_file)
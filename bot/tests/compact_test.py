@@ -0,0 +1,102 @@
+"""
+Author : schackartk
+Purpose: Model compaction tests
+Date   : 19 October 2026
+"""
+
+import helpers as hp  # Custom helpers
+import numpy as np    # Compare scores
+import os             # Check for files
+import pandas as pd   # Read labeled data
+import pickle         # Read compacted model
+import re             # Regular expressions
+import roc            # Unpruned split scores
+import search         # Train/test splits
+import shutil
+
+from compact import pruned_scores
+from subprocess import getstatusoutput
+
+PRG = './compact.py'
+
+
+# --------------------------------------------------
+def test_exists():
+    """ compact.py exists """
+
+    assert os.path.isfile(PRG)
+
+
+# --------------------------------------------------
+def test_usage():
+    """ compact.py usage """
+
+    for flag in ['-h', '--help']:
+        rv, out = getstatusoutput(f'{PRG} {flag}')
+        assert rv == 0
+        assert re.match("usage", out, re.IGNORECASE)
+
+
+# --------------------------------------------------
+def test_bad_input():
+    """ Bad input for required file"""
+
+    bad_file = hp.random_string()
+
+    rv, out = getstatusoutput(f'{PRG} -m {bad_file}')
+    assert rv > 0
+    assert out == f'Model file "{bad_file}" not found.'
+
+
+# --------------------------------------------------
+def test_pruned_scores():
+    """ Split scores come from pruned models, unchanged if nothing is cut """
+
+    data = pd.read_csv('../data/all_labeled_data.txt', delimiter='\t',
+                       header=0)
+    config = search.VecConfig(1, False, ('ramen', 'food', 'FoodPorn'))
+    splits = search.build_matrices(data, config, 2, 0.2, 0)['splits']
+
+    labels, scores = roc.split_scores(splits, 1.0)
+    same_labels, same_scores = pruned_scores(splits, 1.0, 0.0, False)
+    assert np.array_equal(labels, same_labels)
+    assert np.allclose(scores, same_scores)
+
+    _, pruned = pruned_scores(splits, 1.0, 0.5, True)
+    assert pruned.shape == scores.shape
+    assert not np.allclose(scores, pruned)
+
+
+# --------------------------------------------------
+def test_runs_okay():
+    """ Runs on model made by bayes.py """
+
+    out_dir = 'out_test'
+    try:
+        if os.path.isdir(out_dir):
+            shutil.rmtree(out_dir)
+
+        os.makedirs(out_dir)
+
+        rv, _ = getstatusoutput(f'./bayes.py -o {out_dir}/model.pkl '
+                                f'-t {out_dir}/test_data.npz')
+        assert rv == 0
+
+        rv, out = getstatusoutput(f'{PRG} -m {out_dir}/model.pkl '
+                                  f'-o {out_dir}/compact.pkl -H -R 3')
+        assert rv == 0
+        assert os.path.isfile(f'{out_dir}/compact.pkl')
+        assert re.search('Accuracy', out)
+
+        # Threshold is chosen again for the compacted model
+        with open(f'{out_dir}/compact.pkl', 'rb') as fh:
+            threshold = pickle.load(fh)[5]
+        assert re.search(rf'^Threshold\s+[\d.]+\s+{threshold:.3f}', out,
+                         re.M)
+
+        full_size = os.path.getsize(f'{out_dir}/model.pkl')
+        assert os.path.getsize(f'{out_dir}/compact.pkl') < full_size
+
+    finally:
+        if os.path.isdir(out_dir):
+            shutil.rmtree(out_dir)
@@ -0,0 +1,132 @@
+"""
+Author : schackartk
+Purpose: Label harvesting tests
+Date   : 19 October 2026
+"""
+
+import helpers as hp  # Custom helpers
+import os             # Check for files
+import pandas as pd   # Read appended data
+import re             # Regular expressions
+import shutil
+
+from subprocess import getstatusoutput
+
+PRG = './harvest.py'
+
+
+# --------------------------------------------------
+def test_exists():
+    """ harvest.py exists """
+
+    assert os.path.isfile(PRG)
+
+
+# --------------------------------------------------
+def test_usage():
+    """ harvest.py usage """
+
+    for flag in ['-h', '--help']:
+        rv, out = getstatusoutput(f'{PRG} {flag}')
+        assert rv == 0
+        assert re.match("usage", out, re.IGNORECASE)
+
+
+# --------------------------------------------------
+def test_bad_input():
+    """ Bad input for required file"""
+
+    bad_file = hp.random_string()
+
+    rv, out = getstatusoutput(f'{PRG} -p {bad_file}')
+    assert rv > 0
+    assert out == f'File: "{bad_file}" not found'
+
+
+# --------------------------------------------------
+def test_runs_okay():
+    """ Only new, distinct, commented posts are appended """
+
+    out_dir = 'out_test'
+    try:
+        if os.path.isdir(out_dir):
+            shutil.rmtree(out_dir)
+
+        os.makedirs(out_dir)
+
+        with open(f'{out_dir}/data.txt', 'w') as fh:
+            print('id\tlabel\tsub\ttitle', file=fh)
+            print("aaa111\t1\tramen\t'Tonkatsu ramen at home'", file=fh)
+
+        with open(f'{out_dir}/deleted.txt', 'w') as fh:
+            print('zzz999', file=fh)  # Old row, no post id
+            print('ccc111\tbbb333', file=fh)
+
+        with open(f'{out_dir}/posts.txt', 'w') as fh:
+            print('id\tpred\tcom\tsub\ttitle', file=fh)
+            print('sss000\t1\t1\t\t', file=fh)  # Summon
+            print("aaa111\t1\t1\tramen\t'Tonkatsu ramen at home'", file=fh)
+            print("bbb222\t1\t1\tramen\t'TONKATSU ramen at home!'", file=fh)
+            print("bbb333\t1\t1\tfood\t'Tonkatsu sandwich'", file=fh)
+            print("bbb444\t1\t1\tramen\t'My first tonkatsu broth'", file=fh)
+            print("bbb444\t1\t1\tramen\t'My first tonkatsu broth'", file=fh)
+            print("bbb555\t0\t0\tfood\t'Tonkotsu ramen'", file=fh)
+
+        rv, out = getstatusoutput(f'{PRG} -d {out_dir}/data.txt '
+                                  f'-D {out_dir}/deleted.txt '
+                                  f'-p {out_dir}/posts.txt')
+        assert rv == 0
+        assert out == f'Appended 2 new rows to "{out_dir}/data.txt".'
+
+        with open(f'{out_dir}/data.txt', 'r') as fh:
+            rows = fh.read().splitlines()
+
+        # Deleted comment means the bot was wrong
+        assert rows[2:] == ["bbb333\t0\tfood\t'Tonkatsu sandwich'",
+                            "bbb444\t1\tramen\t'My first tonkatsu broth'"]
+
+        # Nothing new the second time, unless predictions are wanted
+        rv, out = getstatusoutput(f'{PRG} -d {out_dir}/data.txt '
+                                  f'-D {out_dir}/deleted.txt '
+                                  f'-p {out_dir}/posts.txt -a')
+        assert rv == 0
+        assert out == f'Appended 1 new row to "{out_dir}/data.txt".'
+
+    finally:
+        if os.path.isdir(out_dir):
+            shutil.rmtree(out_dir)
+
+
+# --------------------------------------------------
+def test_no_trailing_newline():
+    """ Rows are not joined onto a last line with no newline """
+
+    out_dir = 'out_test'
+    try:
+        if os.path.isdir(out_dir):
+            shutil.rmtree(out_dir)
+
+        os.makedirs(out_dir)
+
+        with open(f'{out_dir}/data.txt', 'w') as fh:
+            fh.write("id\tlabel\tsub\ttitle\n"
+                     "aaa111\t1\tramen\t'Tonkatsu ramen at home'")
+
+        open(f'{out_dir}/deleted.txt', 'w').close()
+
+        with open(f'{out_dir}/posts.txt', 'w') as fh:
+            print('id\tpred\tcom\tsub\ttitle', file=fh)
+            print("bbb444\t1\t1\tramen\t'My first tonkatsu broth'", file=fh)
+
+        rv, out = getstatusoutput(f'{PRG} -d {out_dir}/data.txt '
+                                  f'-D {out_dir}/deleted.txt '
+                                  f'-p {out_dir}/posts.txt')
+        assert rv == 0
+        assert out == f'Appended 1 new row to "{out_dir}/data.txt".'
+
+        data = pd.read_csv(f'{out_dir}/data.txt', delimiter='\t', header=0)
+        assert list(data.id) == ['aaa111', 'bbb444']
+
+    finally:
+        if os.path.isdir(out_dir):
+            shutil.rmtree(out_dir)
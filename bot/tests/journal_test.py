@@ -0,0 +1,62 @@
+"""
+Author : schackartk
+Purpose: Action journal tests
+Date   : 19 October 2026
+"""
+
+import helpers as hp  # Custom helpers
+import os             # Check for files
+
+from journal import Journal
+
+
+# --------------------------------------------------
+def test_pending_and_checkpoint():
+    """ Only incomplete actions are replayed """
+
+    journal_file = hp.random_string()
+    try:
+        journal = Journal(journal_file)
+        assert not journal.pending()
+
+        finished = journal.begin('delete', comment='abc123')
+        journal.step(finished, 'recorded')
+        journal.done(finished)
+
+        in_flight = journal.begin('post', post='xyz789', pred=1, act=1)
+        journal.step(in_flight, 'comment-')
+
+        pending = Journal(journal_file).pending()
+        assert len(pending) == 1
+        assert pending[0]['data']['post'] == 'xyz789'
+        assert list(pending[0]['steps']) == ['comment-']
+
+        # Nothing is dropped while an action is in flight
+        assert not journal.checkpoint()
+
+        journal.done(in_flight)
+        assert journal.checkpoint()
+        assert os.path.getsize(journal_file) == 0
+
+    finally:
+        if os.path.isfile(journal_file):
+            os.remove(journal_file)
+
+
+# --------------------------------------------------
+def test_torn_write():
+    """ A half written line from a crash is ignored """
+
+    journal_file = hp.random_string()
+    try:
+        journal = Journal(journal_file)
+        entry = journal.begin('summon', mention='m1')
+
+        with open(journal_file, 'a') as fh:
+            fh.write('{"op": "done", "id"')
+
+        assert [e['id'] for e in journal.pending()] == [entry['id']]
+
+    finally:
+        if os.path.isfile(journal_file):
+            os.remove(journal_file)
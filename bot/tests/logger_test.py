@@ -0,0 +1,65 @@
+"""
+Author : schackartk
+Purpose: Logging pipeline tests
+Date   : 19 October 2026
+"""
+
+import atexit         # Undo listener registration
+import gzip           # Read rotated logs
+import json           # Parse JSON lines
+import logger         # Logging set up to be tested
+import logging        # Restore root logger
+import os             # Check for files
+import re             # Regular expressions
+import shutil
+
+from subprocess import getstatusoutput
+
+
+# --------------------------------------------------
+def test_rotation_and_json(capsys):
+    """ JSON lines rotate into compressed files """
+
+    out_dir = 'out_test'
+    root = logging.getLogger()
+    old_handlers, old_level = root.handlers, root.level
+    try:
+        if os.path.isdir(out_dir):
+            shutil.rmtree(out_dir)
+
+        os.makedirs(out_dir)
+        log_file = f'{out_dir}/.log'
+
+        listener = logger.setup_logging(log_file, max_bytes=500, backups=2,
+                                        json_lines=True, compress=True)
+        for i in range(30):
+            logger.report(f'Tonkatsu found in post: {i}.')
+        logging.info('Not shown on console.')
+        listener.stop()
+        atexit.unregister(listener.stop)
+
+        with open(log_file) as fh:
+            records = [json.loads(line) for line in fh]
+        assert records[-1]['msg'] == 'Not shown on console.'
+
+        with gzip.open(f'{log_file}.1.gz', 'rt') as fh:
+            assert json.loads(fh.readline())['level'] == 'INFO'
+        assert not os.path.isfile(f'{log_file}.3.gz')
+
+        out = capsys.readouterr().out
+        assert 'Tonkatsu found in post: 29.' in out
+        assert 'Not shown' not in out
+
+    finally:
+        root.handlers, root.level = old_handlers, old_level
+        if os.path.isdir(out_dir):
+            shutil.rmtree(out_dir)
+
+
+# --------------------------------------------------
+def test_bench_runs():
+    """ bench_log.py runs """
+
+    rv, out = getstatusoutput('./bench_log.py -n 20 -g 0')
+    assert rv == 0
+    assert re.search(r'^report \(json\)', out, re.M)
@@ -0,0 +1,92 @@
+"""
+Author : schackartk
+Purpose: Model publish gate tests
+Date   : 19 October 2026
+"""
+
+import filecmp        # Compare model files
+import helpers as hp  # Custom helpers
+import os             # Check for files
+import re             # Regular expressions
+import shutil
+
+from subprocess import getstatusoutput
+
+PRG = './publish.py'
+
+
+# --------------------------------------------------
+def test_exists():
+    """ publish.py exists """
+
+    assert os.path.isfile(PRG)
+
+
+# --------------------------------------------------
+def test_usage():
+    """ publish.py usage """
+
+    for flag in ['-h', '--help']:
+        rv, out = getstatusoutput(f'{PRG} {flag}')
+        assert rv == 0
+        assert re.match("usage", out, re.IGNORECASE)
+
+
+# --------------------------------------------------
+def test_bad_input():
+    """ Bad input for candidate """
+
+    bad_file = hp.random_string()
+
+    rv, out = getstatusoutput(f'{PRG} {bad_file}')
+    assert rv > 0
+    assert out == f'File: "{bad_file}" not found'
+
+
+# --------------------------------------------------
+def test_runs_okay():
+    """ Candidate is published only within budgets """
+
+    out_dir = 'out_test'
+    live = f'{out_dir}/live.pkl'
+    try:
+        if os.path.isdir(out_dir):
+            shutil.rmtree(out_dir)
+
+        os.makedirs(out_dir)
+
+        for name in ['first', 'second']:
+            rv, _ = getstatusoutput(f'./bayes.py -o {out_dir}/{name}.pkl '
+                                    f'-t {out_dir}/test_data.npz')
+            assert rv == 0
+
+        # Nothing to compare with, so published as is
+        rv, out = getstatusoutput(f'{PRG} {out_dir}/first.pkl -m {live} '
+                                  '-n 50 -r 2')
+        assert rv == 0
+        assert out.endswith(f'Published "{out_dir}/first.pkl" to "{live}".')
+        assert filecmp.cmp(f'{out_dir}/first.pkl', live, shallow=False)
+
+        # Demanding a perfect score can't be met
+        rv, out = getstatusoutput(f'{PRG} {out_dir}/second.pkl -m {live} '
+                                  '-n 50 -r 2 -a -1')
+        assert rv > 0
+        assert out.endswith('Not published, over budget: accuracy.')
+        assert filecmp.cmp(f'{out_dir}/first.pkl', live, shallow=False)
+
+        rv, out = getstatusoutput(f'{PRG} {out_dir}/second.pkl -m {live} '
+                                  '-n 50 -r 2 -a 1 -l 100 -L 100 -D')
+        assert rv == 0
+        assert re.search(r'^p99 \(us\)', out, re.M)
+        assert filecmp.cmp(f'{out_dir}/first.pkl', live, shallow=False)
+
+        rv, out = getstatusoutput(f'{PRG} {out_dir}/second.pkl -m {live} '
+                                  '-n 50 -r 2 -a 1 -l 100 -L 100')
+        assert rv == 0
+        assert filecmp.cmp(f'{out_dir}/second.pkl', live, shallow=False)
+        assert filecmp.cmp(f'{out_dir}/first.pkl', f'{live}.prev',
+                           shallow=False)
+
+    finally:
+        if os.path.isdir(out_dir):
+            shutil.rmtree(out_dir)
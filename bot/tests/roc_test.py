@@ -0,0 +1,107 @@
+"""
+Author : schackartk
+Purpose: Threshold sweep tests
+Date   : 19 October 2026
+"""
+
+import bayes          # Model artifact format
+import helpers as hp  # Custom helpers
+import numpy as np    # Test arrays
+import os             # Check for files
+import pickle         # Read model artifact
+import re             # Regular expressions
+import shutil
+
+from roc import sweep
+from subprocess import getstatusoutput
+
+PRG = './roc.py'
+
+
+# --------------------------------------------------
+def test_exists():
+    """ roc.py exists """
+
+    assert os.path.isfile(PRG)
+
+
+# --------------------------------------------------
+def test_usage():
+    """ roc.py usage """
+
+    for flag in ['-h', '--help']:
+        rv, out = getstatusoutput(f'{PRG} {flag}')
+        assert rv == 0
+        assert re.match("usage", out, re.IGNORECASE)
+
+
+# --------------------------------------------------
+def test_bad_input():
+    """ Bad input for required file"""
+
+    bad_file = hp.random_string()
+
+    rv, out = getstatusoutput(f'{PRG} -m {bad_file}')
+    assert rv > 0
+    assert out == f'Model file "{bad_file}" not found.'
+
+
+# --------------------------------------------------
+def test_sweep():
+    """ Curves and costs at each distinct score """
+
+    labels = np.array([1, 1, 0, 1, 0, 0])
+    scores = np.array([0.9, 0.8, 0.8, 0.6, 0.3, 0.1])
+
+    curve = sweep(labels, scores)
+
+    assert list(curve['thresholds']) == [np.inf, 0.9, 0.8, 0.6, 0.3, 0.1]
+    assert list(curve['tpr']) == [0, 1 / 3, 2 / 3, 1, 1, 1]
+    assert list(curve['fpr']) == [0, 0, 1 / 3, 1 / 3, 2 / 3, 1]
+    assert curve['auc'] == 5 / 6
+    assert curve['thresholds'][curve['best']] == 0.6
+
+    # Missing a misspelling costs more, so comment on everything
+    curve = sweep(labels, scores, fp_cost=1, fn_cost=10)
+    assert curve['thresholds'][curve['best']] == 0.6
+
+    # Wrong comments cost more, so only the surest title
+    curve = sweep(labels, scores, fp_cost=10, fn_cost=1)
+    assert curve['thresholds'][curve['best']] == 0.9
+
+    # Even when never commenting would cost least, a threshold is chosen
+    curve = sweep(np.array([0, 1]), np.array([0.9, 0.5]), fp_cost=10)
+    assert curve['cost'][0] < curve['cost'][2]
+    assert curve['thresholds'][curve['best']] == 0.5
+
+
+# --------------------------------------------------
+def test_runs_okay():
+    """ Threshold is saved into model made by bayes.py """
+
+    out_dir = 'out_test'
+    try:
+        if os.path.isdir(out_dir):
+            shutil.rmtree(out_dir)
+
+        os.makedirs(out_dir)
+
+        rv, _ = getstatusoutput(f'./bayes.py -o {out_dir}/model.pkl '
+                                f'-t {out_dir}/test_data.npz')
+        assert rv == 0
+
+        rv, out = getstatusoutput(f'{PRG} -m {out_dir}/model.pkl -R 3 '
+                                  f'-o {out_dir}/roc.svg')
+        assert rv == 0
+        assert os.path.isfile(f'{out_dir}/roc.svg')
+        assert re.search('ROC AUC', out)
+
+        with open(f'{out_dir}/model.pkl', 'rb') as fh:
+            threshold = bayes.unpack_model(pickle.load(fh))[5]
+
+        assert out.endswith(f'Threshold {threshold:.3f} saved to '
+                            f'"{out_dir}/model.pkl".')
+
+    finally:
+        if os.path.isdir(out_dir):
+            shutil.rmtree(out_dir)
@@ -0,0 +1,53 @@
+"""
+Author : schackartk
+Purpose: Hyperparameter search tests
+Date   : 19 October 2026
+"""
+
+import helpers as hp  # Custom helpers
+import os             # Check for files
+import re             # Regular expressions
+
+from subprocess import getstatusoutput
+
+PRG = './search.py'
+
+
+# --------------------------------------------------
+def test_exists():
+    """ search.py exists """
+
+    assert os.path.isfile(PRG)
+
+
+# --------------------------------------------------
+def test_usage():
+    """ search.py usage """
+
+    for flag in ['-h', '--help']:
+        rv, out = getstatusoutput(f'{PRG} {flag}')
+        assert rv == 0
+        assert re.match("usage", out, re.IGNORECASE)
+
+
+# --------------------------------------------------
+def test_bad_input():
+    """ Bad input for required file"""
+
+    bad_file = hp.random_string()
+
+    rv, out = getstatusoutput(f'{PRG} -d {bad_file}')
+    assert rv > 0
+    assert out == f'Data file "{bad_file}" not found.'
+
+
+# --------------------------------------------------
+def test_runs_okay():
+    """ Ranks every candidate of a small grid """
+
+    rv, out = getstatusoutput(f'{PRG} -a 0.5,1 -n 1 -R 2 -p 2')
+    assert rv == 0
+
+    # 2 alphas, keyword kept and dropped
+    rows = re.findall(r'^\s+\d+\s+[\d.]+\s+1\s+(?:kept|drop)', out, re.M)
+    assert len(rows) == 4